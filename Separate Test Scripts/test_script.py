@@ -1,13 +1,17 @@
+import os
+import sys
 import openpyxl
 from openpyxl.styles import Font
 from openpyxl import Workbook, load_workbook
 from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 import requests
 
+# Shared helpers live in the project root, next to test.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser import create_chrome_driver
+
 
 # Initialize the Excel report
 def initialize_excel_report():
@@ -110,9 +114,8 @@ def main():
     options.add_argument('--headless')  
     options.add_argument('--disable-gpu')  
 
-    # Use Service to pass the executable path
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    # Start Chrome with a locally resolved chromedriver (see driver_resolver.py)
+    driver = create_chrome_driver(options)
     
     # Test site URL
     url = "https://www.alojamiento.io/property/apartamentos-centro-coló3n/BC-189483"
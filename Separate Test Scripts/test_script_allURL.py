@@ -1,9 +1,37 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
+import requests
 from openpyxl.styles import Font
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 
+# Shared helpers live in the project root, next to test.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from page_extract import extract_page_data
+from url_utils import build_url_set, normalize_url
+from parallel_runner import DEFAULT_WORKERS, run_parallel
+from tab_pool import DEFAULT_TABS, run_in_tabs
+from instrumentation import MemorySampler
+from change_detection import DEFAULT_STATE_PATH, PageStateStore, check_page, detect_changes
+from crawler import DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES, SiteCrawler
+from link_cache import LinkCache
+from link_checker import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, create_session
+from link_registry import LINK_STATUS_HEADERS, LinkRegistry
+from static_audit import links_from_html
+from browser import create_chrome_driver
+from checkpoint import CheckpointJournal
+from perf_metrics import DEFAULT_THRESHOLDS, PERFORMANCE_HEADERS, collect_page_metrics, parse_thresholds, performance_row
+
+# Performance row of a page tested from static HTML, where no browser timings exist
+STATIC_PERFORMANCE = [None] * 6 + ["N/A", "Not measured (static HTML)"]
+# Performance row of an unchanged page: its structure hash says nothing about its timings, so old ones are not reused
+CACHED_PERFORMANCE = [None] * 6 + ["N/A", "Not measured (cached)"]
+
 # Initialize the Excel workbook and sheets
 def initialize_excel_report():
     workbook = openpyxl.Workbook()
@@ -11,35 +39,33 @@ def initialize_excel_report():
     # Create separate sheets for each test
     sheet_h1 = workbook.active
     sheet_h1.title = "H1 Tag Test"
-    sheet_h1.append(["URL", "Status", "Comments"])
+    sheet_h1.append(["URL", "Status", "Comments", "Source"])
     
     sheet_html_sequence = workbook.create_sheet(title="HTML Tag Sequence")
-    sheet_html_sequence.append(["URL", "Status", "Comments"])
+    sheet_html_sequence.append(["URL", "Status", "Comments", "Source"])
     
     sheet_image_alt = workbook.create_sheet(title="Image Alt Test")
-    sheet_image_alt.append(["URL", "Status", "Comments"])
+    sheet_image_alt.append(["URL", "Status", "Comments", "Source"])
+    
+    sheet_performance = workbook.create_sheet(title="Page Performance")
+    sheet_performance.append(PERFORMANCE_HEADERS + ["Source"])
     
     # Make headers bold
-    for sheet in [sheet_h1, sheet_html_sequence, sheet_image_alt]:
+    for sheet in [sheet_h1, sheet_html_sequence, sheet_image_alt, sheet_performance]:
         for cell in sheet[1]:
             cell.font = Font(bold=True)
     
-    return workbook, sheet_h1, sheet_html_sequence, sheet_image_alt
+    return workbook, sheet_h1, sheet_html_sequence, sheet_image_alt, sheet_performance
 
 # H1 Tag Existence Test
-def test_h1_tag(driver, url):
-    driver.get(url)
-    try:
-        driver.find_element(By.TAG_NAME, "h1")
+def test_h1_tag(page_data):
+    if 1 in page_data["headings"]:
         return ("Pass", "H1 tag found")
-    except:
-        return ("Fail", "H1 tag missing")
+    return ("Fail", "H1 tag missing")
 
 # HTML Tag Sequence Test
-def test_html_tag_sequence(driver, url):
-    driver.get(url)
-    headings = driver.find_elements(By.XPATH, "//h1 | //h2 | //h3 | //h4 | //h5 | //h6")
-    heading_levels = [int(h.tag_name[1]) for h in headings]  # Extract the number from h1, h2, etc.
+def test_html_tag_sequence(page_data):
+    heading_levels = page_data["headings"]  # Heading levels in document order (1 for h1, 2 for h2, etc.)
 
     for i in range(1, len(heading_levels)):
         if heading_levels[i] > heading_levels[i - 1] + 1:
@@ -51,17 +77,64 @@ def test_html_tag_sequence(driver, url):
     return ("Pass", f"Sequence correct: {heading_levels}")
 
 # Image Alt Attribute Test
-def test_image_alt_attribute(driver, url):
-    driver.get(url)
-    images = driver.find_elements(By.TAG_NAME, "img")
-    missing_alt = [img.get_attribute("src") for img in images if not img.get_attribute("alt")]
+def test_image_alt_attribute(page_data):
+    missing_alt = [src for alt_text, src in page_data["images"] if not alt_text]
     
     if missing_alt:
         return ("Fail", f"Missing alt attribute for {len(missing_alt)} images")
     return ("Pass", "All images have alt attributes")
 
+# Run all tests on the data of one page
+def run_tests(page_data):
+    return (test_h1_tag(page_data), test_html_tag_sequence(page_data), test_image_alt_attribute(page_data))
+
+# Load a page once in the browser, run all tests on it and read its performance metrics
+def audit_page(driver, url, thresholds=DEFAULT_THRESHOLDS, registry=None):
+    driver.get(url)
+    return audit_loaded_page(driver, url, thresholds, registry)
+
+# Run all tests on the page loaded in the driver's current tab
+# With a LinkRegistry, the page's links are queued for checking as well
+def audit_loaded_page(driver, url, thresholds=DEFAULT_THRESHOLDS, registry=None):
+    print(f"Testing URL: {url}")
+    page_data = extract_page_data(driver)
+    if registry is not None:
+        registry.add_page(url, page_data["links"])
+    return run_tests(page_data) + (performance_row(collect_page_metrics(driver), thresholds),)
+
+# Report every test as failed when the page could not be audited
+def audit_error(url, error):
+    print(f"Error testing URL {url}: {error}")
+    result = ("Fail", f"Error loading page: {error}")
+    return (result, result, result, [None] * 6 + list(result))
+
 # Main function to perform tests and save results
 def main():
+    parser = argparse.ArgumentParser(description="Run the H1, heading sequence and image alt tests on a list of URLs.")
+    parser.add_argument("--workers", type=int, default=1, help=f"Number of parallel headless Chrome workers (e.g. {DEFAULT_WORKERS})")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless (always on with more than one worker)")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help=f"Pages to load at once in tabs of each Chrome (e.g. {DEFAULT_TABS}), instead of one page per browser")
+    parser.add_argument("--static", action="store_true", help="Test server-rendered HTML without a browser; client-rendered pages still use Chrome")
+    parser.add_argument("--resume", action="store_true", help="Skip pages completed by an interrupted run and rebuild the report from its journal")
+    parser.add_argument("--crawl", metavar="SITE_URL",
+                        help="Discover the pages from the site's sitemap and internal links instead of the URL list")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, help="Link depth to crawl beyond the sitemap")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Maximum number of pages to crawl")
+    parser.add_argument("--crawl-host", action="append",
+                        help="Host the crawler may follow links to; repeat for several (default: the host of SITE_URL)")
+    parser.add_argument("--check-links", action="store_true",
+                        help="Check the links of every page, each distinct link once, and list broken ones with the pages they are on")
+    parser.add_argument("--full-run", action="store_true", help="Re-test every page, even those unchanged since the last run")
+    parser.add_argument("--page-state", default=DEFAULT_STATE_PATH, help="File with the validators and results of the last run")
+    parser.add_argument("--perf-threshold", action="append", metavar="METRIC=VALUE",
+                        help="Override a page performance threshold, e.g. lcp=3000 or cls=0.25 (see perf_metrics.py)")
+    args = parser.parse_args()
+    try:
+        perf_thresholds = parse_thresholds(args.perf_threshold)
+    except ValueError as e:
+        parser.error(str(e))
+
     # List of URLs to test
 
     urls = [
@@ -201,36 +274,184 @@ def main():
  
     ]
     
-    # Set up the WebDriver
+    # Set up the WebDriver options; every worker starts its own Chrome
     options = Options()
-    #options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
+    if args.headless or args.workers > 1 or args.tabs > 1:
+        options.add_argument("--headless")
     
     # Initialize the Excel report
-    workbook, sheet_h1, sheet_html_sequence, sheet_image_alt = initialize_excel_report()
+    workbook, sheet_h1, sheet_html_sequence, sheet_image_alt, sheet_performance = initialize_excel_report()
     
-    # Loop through each URL and run all tests
-    for url in urls:
-        print(f"Testing URL: {url}")
-        
-        # H1 Tag Test
-        status, comments = test_h1_tag(driver, url)
-        sheet_h1.append([url, status, comments])
-        
-        # HTML Tag Sequence Test
-        status, comments = test_html_tag_sequence(driver, url)
-        sheet_html_sequence.append([url, status, comments])
-        
-        # Image Alt Attribute Test
-        status, comments = test_image_alt_attribute(driver, url)
-        sheet_image_alt.append([url, status, comments])
+    # Every tested page is journaled as soon as it finishes; --resume reuses those results
+    journal = CheckpointJournal("test_report_allURL.journal.jsonl", resume=args.resume)
+    page_state = PageStateStore(args.page_state)
+
+    # Pages come from the URL list, or with --crawl from the site map as they are discovered
+    if args.crawl:
+        crawler = SiteCrawler(args.crawl, max_depth=args.max_depth, max_pages=args.max_pages, hosts=args.crawl_host)
+        print(f"Crawling {args.crawl} (depth {args.max_depth}, up to {args.max_pages} pages).")
+        pages = ((normalize_url(url), url) for url in crawler)
+        checks = {}
+    else:
+        # Test each distinct page once; duplicates differing only in case, trailing slash or fragment share a run
+        url_set = build_url_set(urls)
+        print(f"Testing {len(url_set)} distinct pages for {len(urls)} URLs.")
+        pages = url_set.items()
+        # Check the whole list for changes concurrently up front
+        checks = detect_changes({key: url for key, url in url_set.items() if not journal.is_done(key)},
+                                page_state, conditional=not args.full_run)
+
+    results = {}
+    page_urls = {}  # Normalized URL -> URL as listed or discovered, in order
+    cached_keys = set()
+    static_keys = set()
+    session = create_session()
+
+    # With --check-links, every distinct link of the run is checked once in the background while pages are tested
+    registry = LinkRegistry(cache=LinkCache()) if args.check_links else None
+
+    # Links of a page that is not loaded in the browser this run: from the downloaded HTML,
+    # the stored page state, or else a fresh download
+    def register_links(key, url):
+        check = checks.get(key)
+        links = check.page_data["links"] if check is not None and check.page_data is not None else page_state.links(key)
+        if links is None:
+            try:
+                response = session.get(url, timeout=DEFAULT_TIMEOUT)
+                links = links_from_html(response.text, response.url)
+            except requests.RequestException as e:
+                print(f"Could not collect the links of {url}: {e}")
+                return
+        registry.add_page(url, links)
+
+    # Resolve a page without the browser when possible; returns the URL if it still needs the browser:
+    # journaled pages are reused, pages unchanged since their last test (304 Not Modified or
+    # the same structure hash) reuse the stored results unless --full-run is given, and with
+    # --static server-rendered pages are tested from the HTML downloaded by the change check
+    def triage_page(key, url):
+        if journal.is_done(key):
+            results[key] = journal.get(key)
+        else:
+            if key not in checks:
+                checks[key] = check_page(session, url, None if args.full_run else page_state.get(key))
+            check = checks[key]
+            if check.status == "unchanged":
+                results[key] = tuple(page_state.results(key)[:3]) + (CACHED_PERFORMANCE,)
+                cached_keys.add(key)
+            elif args.static and check.page_data is not None:
+                results[key] = run_tests(check.page_data) + (STATIC_PERFORMANCE,)
+                journal.record(key, results[key])
+                static_keys.add(key)
+            else:
+                return url
+        if registry is not None:
+            register_links(key, url)
+        return None
+
+    # Triage pages on a thread pool as they arrive (from the list, or from the crawler while it runs)
+    # and yield only the URLs that still need the browser, so browser workers never wait behind change checks
+    def triage(pages):
+        triaged = queue.Queue()
+        done = object()
+
+        def feed():
+            try:
+                with ThreadPoolExecutor(max_workers=DEFAULT_CONCURRENCY) as executor:
+                    for key, url in pages:
+                        if key not in page_urls:
+                            page_urls[key] = url
+                            executor.submit(triage_page, key, url).add_done_callback(triaged.put)
+            except Exception as e:
+                triaged.put(e)
+            triaged.put(done)
+
+        threading.Thread(target=feed, name="triage-feeder", daemon=True).start()
+        while True:
+            item = triaged.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            url = item.result()
+            if url is not None:
+                yield url
+
+    # Test and journal one page in the browser; with --tabs it has already loaded in the current tab
+    def audit_and_record(driver, url):
+        if args.tabs > 1:
+            result = audit_loaded_page(driver, url, perf_thresholds, registry)
+        else:
+            result = audit_page(driver, url, perf_thresholds, registry)
+        results[normalize_url(url)] = result
+        journal.record(normalize_url(url), result)
+        return result
+
+    # Report a page that could not be audited and keep it out of the stored page state
+    failed_keys = set()
+
+    def audit_failed(url, error):
+        failed_keys.add(normalize_url(url))
+        results[normalize_url(url)] = audit_error(url, error)
+        return results[normalize_url(url)]
+
+    # Workers pull the next page as soon as they are free; a worker only starts Chrome once a page needs it
+    # With --tabs, every worker's Chrome loads that many pages at once and tests each as soon as it has loaded
+    start = time.perf_counter()
+    with MemorySampler() as memory:
+        if args.tabs > 1:
+            browser_pages = run_in_tabs(
+                triage(pages), audit_and_record, lambda: create_chrome_driver(options),
+                tabs=args.tabs, browsers=args.workers, on_error=audit_failed,
+            )
+        else:
+            browser_pages = run_parallel(
+                triage(pages), audit_and_record, lambda: create_chrome_driver(options),
+                workers=args.workers, on_error=audit_failed,
+            )
+    elapsed = time.perf_counter() - start
+    journal.close()
+    session.close()
+
+    # Broken links, each listed once with every page it appears on
+    if registry is not None:
+        sheet_urls = workbook.create_sheet(title="URL Status")
+        sheet_urls.append(LINK_STATUS_HEADERS)
+        for cell in sheet_urls[1]:
+            cell.font = Font(bold=True)
+        for row in registry.broken_link_rows():
+            sheet_urls.append(row)
+        registry.cache.save()
+        registry.close()
+        print(f"Checked {registry.unique_links} distinct links for {registry.occurrences} links on {len(registry.pages)} pages.")
+    print(f"{len(cached_keys)} unchanged pages reused their results, {len(static_keys)} were tested from static HTML "
+          f"and {len(browser_pages)} in the browser.")
+
+    # Throughput and memory of this configuration, to compare browsers x tabs settings between runs
+    peak = memory.peak_rss()
+    rate = len(browser_pages) / elapsed * 60 if elapsed else 0
+    print(f"{args.workers} browser(s) x {args.tabs} tab(s): {len(browser_pages)} browser pages in {elapsed:.1f}s "
+          f"({rate:.1f} pages/min), peak RSS {peak if peak is not None else 'n/a'} MB.")
+
+    # Remember the validators and results of every freshly tested page for the next run
+    for key, check in checks.items():
+        if key in results and key not in cached_keys and key not in failed_keys and check.status != "error":
+            page_state.update(key, check, results[key], registry.pages.get(page_urls[key]) if registry else None)
+    page_state.save()
+
+    # Fan the results back out so every URL in the list (or every crawled page) gets its rows
+    for url in (page_urls.values() if args.crawl else urls):
+        key = normalize_url(url)
+        h1_result, sequence_result, image_alt_result, *performance = results[key]
+        source = "cached" if key in cached_keys else "tested"
+        sheet_h1.append([url, *h1_result, source])
+        sheet_html_sequence.append([url, *sequence_result, source])
+        sheet_image_alt.append([url, *image_alt_result, source])
+        # Pages journaled before the performance check was added have no metrics
+        sheet_performance.append([url, *(performance[0] if performance else [None] * 6 + ["N/A", "Not measured"]), source])
     
     # Save the Excel report
     workbook.save("test_report_allURL.xlsx")
     print("All tests completed. Report saved as 'test_report_allURL.xlsx'.")
-    
-    # Quit the WebDriver
-    driver.quit()
 
 # Execute the script
 if __name__ == "__main__":
@@ -1,13 +1,17 @@
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from openpyxl.styles import Font
 from openpyxl import Workbook, load_workbook
 import os
-import time
+import sys
+
+# Shared helpers live in the project root, next to test.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser import create_chrome_driver
+from dom_waits import scroll_into_view, wait_for_text
+from wait_policy import WaitPolicy
 
 
 def save_results_to_excel(results):
@@ -52,22 +56,24 @@ def save_results_to_excel(results):
     print(f"\nTest results saved to '{excel_file}'.")
 
 
-def test_currency_change_for_all(driver, url):
+def test_currency_change_for_all(driver, url, waits):
     # Open the webpage
     driver.get(url)
 
-    # Capture the initial value of the availability price
-    availability_price_element = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, 'js-default-price'))
-    )
+    # Capture the initial value of the availability price; timeouts are learned from earlier runs
+    with waits.wait("initial_availability_price", 10) as timeout:
+        availability_price_element = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.ID, 'js-default-price'))
+        )
     initial_availability_price = availability_price_element.text.strip()
     print(f"Initial Availability Price: {initial_availability_price}")
 
     # Wait for the price elements to load in cards
     print("Waiting for price elements...")
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CLASS_NAME, 'js-price-value'))
-    )
+    with waits.wait("initial_card_prices", 10) as timeout:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_all_elements_located((By.CLASS_NAME, 'js-price-value'))
+        )
     price_elements = driver.find_elements(By.CLASS_NAME, 'js-price-value')
     initial_prices = [elem.text for elem in price_elements]
     print(f"Found {len(initial_prices)} price elements.")
@@ -79,17 +85,18 @@ def test_currency_change_for_all(driver, url):
 
     # Scroll to the footer section to locate the currency dropdown
     print("Waiting for currency dropdown to become present...")
-    WebDriverWait(driver, 20).until(
-        EC.presence_of_element_located((By.ID, 'js-currency-sort-footer'))
-    )
+    with waits.wait("currency_dropdown_present", 20) as timeout:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.ID, 'js-currency-sort-footer'))
+        )
     footer_currency_element = driver.find_element(By.ID, 'js-currency-sort-footer')
-    driver.execute_script("arguments[0].scrollIntoView(true);", footer_currency_element)
-    time.sleep(1)  # Wait for the scroll to complete
+    scroll_into_view(driver, footer_currency_element)
 
     # Click on the currency dropdown
-    currency_dropdown = WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.ID, 'js-currency-sort-footer'))
-    )
+    with waits.wait("currency_dropdown_clickable", 60) as timeout:
+        currency_dropdown = WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable((By.ID, 'js-currency-sort-footer'))
+        )
     currency_dropdown.click()
     print("Currency dropdown clicked.")
 
@@ -110,24 +117,20 @@ def test_currency_change_for_all(driver, url):
         print(f"\nTesting currency: {currency_text}")
 
         # Scroll to and click on the currency option
-        driver.execute_script("arguments[0].scrollIntoView(true);", currency_option)
-        time.sleep(1)
+        scroll_into_view(driver, currency_option)
         try:
             currency_option.click()
         except Exception:
             driver.execute_script("arguments[0].click();", currency_option)
 
-        # Wait for the availability price to update
-        WebDriverWait(driver, 50).until(
-            EC.text_to_be_present_in_element((By.ID, 'js-default-price'), currency_text.split()[0])
-        )
-        updated_availability_price = availability_price_element.text.strip()
+        # Wait until the availability price and the card prices show the new currency
+        with waits.wait("price_update", 50) as timeout:
+            price_update_wait = wait_for_text(driver, ['#js-default-price', '.js-price-value'], currency_text.split()[0], timeout)
+        print(f"Prices updated after {price_update_wait:.2f}s")
+
+        updated_availability_price = driver.find_element(By.ID, 'js-default-price').text.strip()
         print(f"Updated Availability Price: {updated_availability_price}")
 
-        # Wait for the prices to update in the cards
-        WebDriverWait(driver, 50).until(
-            EC.text_to_be_present_in_element((By.CLASS_NAME, 'js-price-value'), currency_text.split()[0])
-        )
         updated_price_elements = driver.find_elements(By.CLASS_NAME, 'js-price-value')
         updated_prices = [elem.text for elem in updated_price_elements]
 
@@ -167,7 +170,7 @@ def test_currency_change_for_all(driver, url):
 
         # Reopen the dropdown for the next currency
         currency_dropdown = driver.find_element(By.ID, 'js-currency-sort-footer')
-        driver.execute_script("arguments[0].scrollIntoView(true);", currency_dropdown)
+        scroll_into_view(driver, currency_dropdown)
         currency_dropdown.click()
         currency_options = driver.find_elements(By.XPATH, "//div[@class='footer-section']//div[@class='footer-currency-dd']//ul[@class='select-ul']//li")
 
@@ -183,13 +186,13 @@ if __name__ == "__main__":
     # options.add_argument('--headless')  # Uncomment to run in headless mode
     options.add_argument('--disable-gpu')
 
-    # Use Service to pass the executable path
-    service = Service(ChromeDriverManager().install())
-
-    # Initialize the WebDriver
-    driver = webdriver.Chrome(service=service, options=options)
+    # Initialize the WebDriver with a locally resolved chromedriver (see driver_resolver.py)
+    driver = create_chrome_driver(options)
 
+    waits = WaitPolicy()
     try:
-        test_currency_change_for_all(driver, "https://www.alojamiento.io/property/apartamentos-centro-coló3n/BC-189483")
+        test_currency_change_for_all(driver, "https://www.alojamiento.io/property/apartamentos-centro-coló3n/BC-189483", waits)
     finally:
         driver.quit()
+        waits.save()
+        print(f"Time lost to timed-out waits: {waits.wasted:.2f}s.")
@@ -1,19 +1,19 @@
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+import os
+import sys
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from openpyxl import Workbook, load_workbook
+from openpyxl import load_workbook
 from openpyxl.styles import Font
 
+# Shared helpers live in the project root, next to test.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser import create_chrome_driver
+
 # Set up Selenium WebDriver with headless Chrome
 chrome_options = Options()
 #chrome_options.add_argument("--headless")  
 
-# Automatically manage ChromeDriver with webdriver_manager
-service = Service(ChromeDriverManager().install())
-
-driver = webdriver.Chrome(service=service, options=chrome_options)
+# Start Chrome with a locally resolved chromedriver (see driver_resolver.py)
+driver = create_chrome_driver(chrome_options)
 
 # URL of the page you want to scrape
 url = "https://www.alojamiento.io/property/apartamentos-centro-coló3n/BC-189483"
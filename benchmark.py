@@ -0,0 +1,326 @@
+# Offline benchmark for the test suite.
+# A local fixture site stands in for the live site: every page carries the
+# markup the tests rely on (h1-h6, img[alt], anchors, #js-default-price,
+# .js-price-value, the js-currency-sort-footer dropdown and a ScriptData
+# global), and its links point back at the fixture server, so the benchmark
+# needs no network. The test.py suite runs against N pages, in Chrome or on
+# the static HTML, and the run reports pages per second, p50/p95 wall time
+# per test and peak memory. Results are saved as JSON and can be compared
+# with an earlier run.
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from browser import create_chrome_driver
+from browser_profiles import LEAN, PROFILES, chrome_options
+from instrumentation import MemorySampler, RunTimings, percentile
+from host_scheduler import HostScheduler
+from link_checker import DEFAULT_CONCURRENCY, create_session
+from page_session import PageSession
+from perf_metrics import DEFAULT_THRESHOLDS
+from report_writer import StreamingReport
+from static_audit import fetch_page_data
+from test import (
+    test_currency_change_for_all, test_h1_tag, test_html_tag_sequence, test_image_alt_attribute,
+    test_page_performance, test_url_status_code, write_scraped_data,
+)
+
+ENGINES = ("browser", "static")
+
+# The fixture server is local, so link checks are not paced like requests to real hosts
+UNTHROTTLED = {"max_per_host": DEFAULT_CONCURRENCY, "rate": 10000.0}
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+CURRENCIES = ["€ EUR", "£ GBP", "¥ JPY", "₹ INR", "CHF CHF", "A$ AUD", "C$ CAD", "R$ BRL", "kr SEK", "zł PLN"]
+CARDS_PER_PAGE = 6
+IMAGES_PER_PAGE = 8
+BROKEN_LINK_EVERY = 10  # Every n-th link on a page returns 404
+
+# Opens the footer dropdown and, on a currency click, rewrites the prices after a delay like the live site
+FIXTURE_SCRIPT = """
+var ScriptData = {
+    config: {SiteUrl: location.origin, SiteName: 'Fixture Site'},
+    pageData: {CampaignId: 'FX-%(index)d'},
+    userInfo: {Browser: 'Chrome', CountryCode: 'XX', IP: '127.0.0.1'}
+};
+var dropdown = document.getElementById('js-currency-sort-footer');
+var options = document.querySelector('.footer-currency-dd .select-ul');
+dropdown.addEventListener('click', function () {
+    options.style.display = options.style.display === 'none' ? 'block' : 'none';
+});
+Array.prototype.forEach.call(options.querySelectorAll('li'), function (li) {
+    li.addEventListener('click', function () {
+        options.style.display = 'none';
+        var symbol = li.textContent.trim().split(' ')[0];
+        dropdown.textContent = li.textContent;
+        setTimeout(function () {
+            Array.prototype.forEach.call(document.querySelectorAll('#js-default-price, .js-price-value'), function (el) {
+                el.textContent = el.textContent.replace(/^\\S+/, symbol);
+            });
+        }, %(price_delay_ms)d);
+    });
+});
+"""
+
+
+# Currency option texts for the fixture dropdown; beyond the real ones, synthetic codes are used
+def fixture_currencies(count):
+    return [CURRENCIES[i] if i < len(CURRENCIES) else f"X{i} X{i}" for i in range(count)]
+
+
+# HTML of fixture page `index`; every 5th page skips a heading level and odd pages miss some alt texts
+def fixture_page_html(index, link_count, currency_count, price_delay_ms=50):
+    levels = [1, 2, 4, 5, 6] if index % 5 == 4 else [1, 2, 3, 4, 5, 6]
+    headings = "".join(f"<h{level}>Fixture heading {level}</h{level}>" for level in levels)
+    images = "".join(
+        f'<img src="/static/image-{i}.png">' if index % 2 and i % 4 == 3 else f'<img src="/static/image-{i}.png" alt="Image {i}">'
+        for i in range(IMAGES_PER_PAGE)
+    )
+    links = "".join(
+        f'<a href="/missing/{i}">Missing {i}</a>' if i % BROKEN_LINK_EVERY == BROKEN_LINK_EVERY - 1 else f'<a href="/link/{i}">Link {i}</a>'
+        for i in range(link_count)
+    )
+    cards = "".join(
+        f'<div class="card"><p>Fixture property {index}-{i}</p><span class="js-price-value">$ {100 + i}</span></div>'
+        for i in range(CARDS_PER_PAGE)
+    )
+    currencies = "".join(f"<li>{currency}</li>" for currency in fixture_currencies(currency_count))
+    text = "<p>" + "Local fixture page standing in for the live site during benchmarks. " * 5 + "</p>"
+    script = FIXTURE_SCRIPT % {"index": index, "price_delay_ms": price_delay_ms}
+    return (
+        f"<!DOCTYPE html><html><head><title>Fixture page {index}</title></head><body>"
+        f"{headings}{text}{images}<div id=\"js-default-price\">$ 100</div>{cards}{links}<a>No href</a>"
+        f"<div class=\"footer-section\"><div class=\"footer-currency-dd\"><div id=\"js-currency-sort-footer\">$ USD</div>"
+        f"<ul class=\"select-ul\" style=\"display:none\">{currencies}</ul></div></div>"
+        f"<script>{script}</script></body></html>"
+    )
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the live site
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        site = self.server.site
+        parts = self.path.split("?")[0].strip("/").split("/")
+        status, content_type, body = 404, "text/plain", b"Not Found"
+        if len(parts) == 2 and parts[0] == "page" and parts[1].isdigit() and int(parts[1]) < site.page_count:
+            status, content_type = 200, "text/html; charset=utf-8"
+            body = fixture_page_html(int(parts[1]), site.link_count, site.currency_count, site.price_delay_ms).encode("utf-8")
+        elif len(parts) == 2 and parts[0] == "link":
+            status, body = 200, b"OK"
+        elif len(parts) == 2 and parts[0] == "static":
+            status, content_type, body = 200, "image/png", b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The link checker opens many connections at once
+
+
+# Local stand-in site served from a background thread; use as a context manager
+class FixtureSite:
+    def __init__(self, page_count, link_count, currency_count, price_delay_ms=50):
+        self.page_count = page_count
+        self.link_count = link_count
+        self.currency_count = currency_count
+        self.price_delay_ms = price_delay_ms
+        self._server = None
+
+    def __enter__(self):
+        self._server = _FixtureServer(("127.0.0.1", 0), _FixtureHandler)
+        self._server.site = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def urls(self):
+        host, port = self._server.server_address
+        return [f"http://{host}:{port}/page/{i}" for i in range(self.page_count)]
+
+
+# Report handed to the checks of every page: each sheet is created on first use and later
+# pages append to it, so the report has the sheets of one test.py run however many pages there are
+class _RunReport:
+    def __init__(self, report):
+        self.report = report
+        self._sheets = {}
+
+    def create_sheet(self, title, headers):
+        if title not in self._sheets:
+            self._sheets[title] = self.report.create_sheet(title, headers)
+        return self._sheets[title]
+
+    def append(self, title, row):
+        self.report.append(title, row)
+
+
+# Run the test.py suite on every page in one Chrome session, structural checks with `profile`
+def run_browser_suite(urls, report, timings, with_currency=True, profile=LEAN):
+    driver = create_chrome_driver(chrome_options(profile))
+    timings.instrument_driver(driver)
+    try:
+        page = PageSession(driver, profile)
+        scheduler = HostScheduler(**UNTHROTTLED)
+        sheet_urls = report.create_sheet("URL Status", ["URL", "Status", "Comments"])
+        for url in urls:
+            tests = [
+                ("H1 Tag Existence", lambda: test_h1_tag(page.data(url))),
+                ("HTML Tag Sequence", lambda: test_html_tag_sequence(page.data(url))),
+                ("Image Alt Attribute", lambda: test_image_alt_attribute(page.data(url), report)),
+                ("URL Status Code", lambda: test_url_status_code(page.data(url), sheet_urls, scheduler=scheduler)),
+                ("Scraped Data", lambda: write_scraped_data(report, page.data(url))),
+                ("Page Performance", lambda: test_page_performance(report, page, url, DEFAULT_THRESHOLDS)),
+            ]
+            if with_currency:
+                tests.append(("Currency Change Test", lambda: test_currency_change_for_all(report, page, url)))
+            _run_tests(report, timings, url, tests)
+    finally:
+        driver.quit()
+
+
+# Run the browserless checks on the fetched HTML of every page (ScriptData needs the browser)
+def run_static_suite(urls, report, timings):
+    session = create_session()
+    scheduler = HostScheduler(**UNTHROTTLED)
+    try:
+        sheet_urls = report.create_sheet("URL Status", ["URL", "Status", "Comments"])
+        for url in urls:
+            fetched = {}
+
+            def fetch():
+                fetched["data"] = fetch_page_data(session, url)
+                return ("Fetch", "Pass" if fetched["data"] else "Fail", "Fetched static HTML")
+
+            tests = [
+                ("Fetch", fetch),
+                ("H1 Tag Existence", lambda: test_h1_tag(fetched["data"])),
+                ("HTML Tag Sequence", lambda: test_html_tag_sequence(fetched["data"])),
+                ("Image Alt Attribute", lambda: test_image_alt_attribute(fetched["data"], report)),
+                ("URL Status Code", lambda: test_url_status_code(fetched["data"], sheet_urls, scheduler=scheduler)),
+            ]
+            _run_tests(report, timings, url, tests)
+    finally:
+        session.close()
+
+
+# Time each test of one page and write its row to the Test Report sheet
+def _run_tests(report, timings, url, tests):
+    for name, run_test in tests:
+        with timings.test(name):
+            test_name, status, comments = run_test()
+            report.append("Test Report", [url, test_name, status, comments])
+
+
+# Run one benchmark configuration; returns the summary written to the results file
+def run_benchmark(engine="browser", pages=10, links=50, currencies=3, price_delay_ms=50, profile=LEAN):
+    with FixtureSite(pages, links, currencies, price_delay_ms) as site, tempfile.TemporaryDirectory() as tmp:
+        report = StreamingReport(os.path.join(tmp, "benchmark"))
+        report.create_sheet("Test Report", ["Page URL", "Test Name", "Status", "Comments"])
+        timings = RunTimings()
+        timings.instrument_report(report)
+        run_report = _RunReport(report)
+        start = time.perf_counter()
+        with MemorySampler() as memory:
+            if engine == "browser":
+                timings.instrument_waits()
+                run_browser_suite(site.urls, run_report, timings, with_currency=currencies > 0, profile=profile)
+            else:
+                run_static_suite(site.urls, run_report, timings)
+            report.close()
+        elapsed = time.perf_counter() - start
+
+    tests = {}
+    for record in timings.tests:
+        tests.setdefault(record["test"], []).append(record)
+    return {
+        "engine": engine,
+        "profile": profile.name if engine == "browser" else None,
+        "pages": pages,
+        "links": links,
+        "currencies": currencies,
+        "elapsed": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 3),
+        "tests": {
+            name: {
+                "runs": len(records),
+                "p50": round(percentile([r["wall"] for r in records], 50), 4),
+                "p95": round(percentile([r["wall"] for r in records], 95), 4),
+                "commands": round(sum(r["commands"] for r in records) / len(records), 1),
+            }
+            for name, records in tests.items()
+        },
+        "report_io": round(timings.totals["report_io"], 3),
+        "peak_rss_mb": memory.peak_rss(),
+    }
+
+
+def print_summary(result, baseline=None):
+    profile = f" ({result['profile']} profile)" if result.get("profile") else ""
+    print(f"\n{result['engine']} engine{profile}: {result['pages']} pages, {result['links']} links/page, "
+          f"{result['currencies']} currencies")
+
+    def change(new, old):
+        return f" ({(new - old) / old * 100:+.1f}%)" if old else ""
+
+    old = baseline or {}
+    print(f"  {result['pages_per_second']:.2f} pages/s in {result['elapsed']:.2f}s"
+          + change(result["pages_per_second"], old.get("pages_per_second")))
+    print(f"  Peak RSS: {result['peak_rss_mb']} MB" + change(result["peak_rss_mb"] or 0, old.get("peak_rss_mb")))
+    print(f"  {'Test':<24}{'p50 (s)':>10}{'p95 (s)':>10}{'Commands':>10}")
+    for name, stats in result["tests"].items():
+        old_stats = old.get("tests", {}).get(name, {})
+        print(f"  {name:<24}{stats['p50']:>10.4f}{stats['p95']:>10.4f}{stats['commands']:>10}"
+              + change(stats["p50"], old_stats.get("p50")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the test suite against a local fixture site.")
+    parser.add_argument("--engine", choices=ENGINES, default="browser",
+                        help="Run the suite in headless Chrome or on the static HTML (no browser needed)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="lean",
+                        help="Browser profile for the structural checks (see browser_profiles.py)")
+    parser.add_argument("--pages", type=int, default=10, help="Number of fixture pages")
+    parser.add_argument("--links", type=int, default=50, help="Links per page (every 10th is broken)")
+    parser.add_argument("--currencies", type=int, default=3, help="Currencies in the footer dropdown (0 skips the currency test)")
+    parser.add_argument("--price-delay-ms", type=int, default=50, help="Delay before the fixture prices change currency")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file for the results")
+    parser.add_argument("--compare", metavar="RESULTS_JSON", help="Show changes against an earlier results file")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.engine, args.pages, args.links, args.currencies, args.price_delay_ms,
+                           PROFILES[args.profile])
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_summary(result, baseline)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
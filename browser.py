@@ -0,0 +1,28 @@
+# Chrome driver factory shared by test.py and the scripts in "Separate Test Scripts"
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from browser_daemon import attach_to_daemon, matches_daemon
+from driver_resolver import resolve_chromedriver
+
+_driver_path = None
+
+
+# Get a Chrome driver: a warm session with the options' page load strategy from the browser
+# daemon when one is running and the options ask for headless Chrome like its sessions (see
+# browser_daemon.py; set BROWSER_DAEMON=off to skip it), otherwise a new Chrome started
+# with the given options. driver.quit() works the same for both.
+def create_chrome_driver(options=None, use_daemon=None):
+    if use_daemon is None:
+        use_daemon = os.environ.get("BROWSER_DAEMON", "on").lower() not in ("0", "off", "false")
+    if use_daemon and matches_daemon(options):
+        driver = attach_to_daemon(page_load_strategy=options.page_load_strategy)
+        if driver is not None:
+            return driver
+
+    global _driver_path
+    if _driver_path is None:
+        _driver_path = resolve_chromedriver()
+    return webdriver.Chrome(service=Service(_driver_path), options=options or webdriver.ChromeOptions())
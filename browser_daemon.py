@@ -0,0 +1,270 @@
+# Warm browser pool daemon.
+# Keeps a few headless Chrome sessions running and lends them to the test
+# scripts over a local socket, so short runs skip the browser cold start.
+# The page load strategy is fixed when a session starts, so the daemon keeps
+# a pool of sessions per strategy (by default "normal" for the full profile
+# and "eager" for the lean one).
+# Protocol: one JSON object per line on a TCP connection to 127.0.0.1.
+#   {"op": "acquire", "page_load_strategy": ...} -> {"executor_url": ..., "session_id": ...} or {"error": ...}
+#   {"op": "release", "session_id": ...} -> {"ok": true}
+#   {"op": "status"} -> {<strategy>: {"size": ..., "idle": ...}, ...}
+# A session is reset (extra tabs closed, cookies and cache cleared, storage of
+# the open page cleared, about:blank loaded) when it is released or when its
+# client disconnects.
+#
+# Usage: python browser_daemon.py --size 4 [--strategies normal,eager]
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+DEFAULT_ADDRESS = os.environ.get("BROWSER_DAEMON_ADDRESS", "127.0.0.1:47800")
+DEFAULT_SIZE = 2  # Sessions per page load strategy
+DEFAULT_STRATEGIES = ("normal", "eager")
+REQUEST_TIMEOUT = 2  # seconds to wait for a daemon reply before treating it as unavailable
+
+
+def _split_address(address):
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+# Pool of warm Chrome sessions owned by the daemon
+class BrowserPool:
+    def __init__(self, size, create_driver):
+        self.create_driver = create_driver
+        self._lock = threading.Lock()
+        self._drivers = {}
+        self._idle = []
+        for _ in range(size):
+            self._add_driver()
+
+    def _add_driver(self):
+        driver = self.create_driver()
+        self._drivers[driver.session_id] = driver
+        self._idle.append(driver.session_id)
+
+    # Lend an idle session; returns None when all sessions are in use
+    def acquire(self):
+        with self._lock:
+            if not self._idle:
+                return None
+            driver = self._drivers[self._idle.pop()]
+        return {"executor_url": driver.service.service_url, "session_id": driver.session_id}
+
+    # Reset a returned session and put it back; a broken session is replaced
+    def release(self, session_id):
+        driver = self._drivers.get(session_id)
+        if driver is None:
+            return
+        try:
+            reset_session(driver)
+        except WebDriverException as e:
+            print(f"Replacing browser session {session_id} after failed reset: {e}")
+            with self._lock:
+                del self._drivers[session_id]
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            self._add_driver()
+            return
+        with self._lock:
+            self._idle.append(session_id)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._drivers
+
+    def status(self):
+        with self._lock:
+            return {"size": len(self._drivers), "idle": len(self._idle)}
+
+    def close(self):
+        for driver in self._drivers.values():
+            driver.quit()
+
+
+# Bring a session back to a clean state: one tab, no cookies or cache, empty page storage
+def reset_session(driver):
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException:
+        pass  # No storage on about:blank or opaque origins
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})  # Undo a lean browser profile
+    driver.get("about:blank")
+
+
+# One client connection; sessions still held when it disconnects are released
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        pools = self.server.pools
+        held = {}  # session id -> pool it was borrowed from
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "acquire":
+                    strategy = request.get("page_load_strategy", "normal")
+                    pool = pools.get(strategy)
+                    lease = pool.acquire() if pool is not None else None
+                    if pool is None:
+                        response = {"error": f"no browser sessions with page load strategy '{strategy}'"}
+                    elif lease is None:
+                        response = {"error": f"no idle browser session with page load strategy '{strategy}'"}
+                    else:
+                        held[lease["session_id"]] = pool
+                        response = lease
+                elif op == "release":
+                    session_id = request["session_id"]
+                    pool = held.pop(session_id, None) or next((p for p in pools.values() if session_id in p), None)
+                    if pool is not None:
+                        pool.release(session_id)
+                    response = {"ok": True}
+                elif op == "status":
+                    response = {strategy: pool.status() for strategy, pool in pools.items()}
+                else:
+                    response = {"error": f"unknown op '{op}'"}
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except (OSError, ValueError):
+            pass
+        finally:
+            for session_id, pool in held.items():
+                pool.release(session_id)
+
+
+class _DaemonServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# Chrome attached to a session owned by the daemon; quit() hands it back instead of closing it
+class AttachedChrome(webdriver.Remote):
+    def __init__(self, connection, executor_url, session_id):
+        self._connection = connection
+        self._attached_session_id = session_id
+        executor = ChromiumRemoteConnection(executor_url, vendor_prefix="goog", browser_name="chrome")
+        super().__init__(command_executor=executor, options=webdriver.ChromeOptions())
+
+    # Reuse the daemon's session instead of creating a new one
+    def start_session(self, capabilities):
+        self.session_id = self._attached_session_id
+        self.caps = capabilities
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    # The daemon also releases the session when the connection closes, so a failed release is not an error
+    def quit(self):
+        try:
+            self._connection.request({"op": "release", "session_id": self.session_id})
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._connection.close()
+
+
+# Line-based JSON connection to the daemon
+# Replies are awaited for at most request_timeout, so a wedged daemon or another
+# program listening on the port cannot hang the caller
+class DaemonConnection:
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=0.5, request_timeout=REQUEST_TIMEOUT):
+        self._socket = socket.create_connection(_split_address(address), timeout=timeout)
+        self._socket.settimeout(request_timeout)
+        self._file = self._socket.makefile("rwb")
+
+    def request(self, message):
+        self._file.write((json.dumps(message) + "\n").encode("utf-8"))
+        self._file.flush()
+        return json.loads(self._file.readline())
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+# Options the daemon starts its sessions with the given page load strategy with
+def daemon_options(page_load_strategy="normal"):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.page_load_strategy = page_load_strategy
+    return options
+
+
+# True when a Chrome started with `options` would run like a daemon session: headless
+# The page load strategy is matched by the pool the session is borrowed from
+def matches_daemon(options):
+    if options is None:
+        return False
+    return any(argument.startswith("--headless") for argument in options.arguments)
+
+
+# Borrow a warm session with the given page load strategy from the daemon
+# Returns None when no daemon or no idle session with that strategy is available
+def attach_to_daemon(address=DEFAULT_ADDRESS, page_load_strategy="normal"):
+    try:
+        connection = DaemonConnection(address)
+    except OSError:
+        return None
+    try:
+        lease = connection.request({"op": "acquire", "page_load_strategy": page_load_strategy})
+        if not isinstance(lease, dict):
+            raise ValueError("unexpected reply")
+    except (OSError, ValueError) as e:  # socket.timeout is an OSError
+        connection.close()
+        print(f"Ignoring unresponsive browser daemon at {address}: {e or 'no reply'}")
+        return None
+    if "error" in lease:
+        connection.close()
+        print(f"Browser daemon at {address} unavailable: {lease['error']}")
+        return None
+    print(f"Attached to warm browser session {lease['session_id']} from {address}")
+    return AttachedChrome(connection, lease["executor_url"], lease["session_id"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep warm headless Chrome sessions for the test scripts.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                        help="Number of warm browser sessions per page load strategy")
+    parser.add_argument("--strategies", default=",".join(DEFAULT_STRATEGIES),
+                        help="Comma-separated page load strategies to keep sessions for")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="host:port to listen on")
+    args = parser.parse_args()
+
+    from browser import create_chrome_driver
+
+    strategies = [strategy.strip() for strategy in args.strategies.split(",") if strategy.strip()]
+    pools = {
+        strategy: BrowserPool(args.size, lambda strategy=strategy: create_chrome_driver(daemon_options(strategy), use_daemon=False))
+        for strategy in strategies
+    }
+    server = _DaemonServer(_split_address(args.address), _DaemonHandler)
+    server.pools = pools
+    print(f"Browser daemon listening on {args.address} with {args.size} warm session(s) each for: {', '.join(strategies)}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pool in pools.values():
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Browser profiles for page loads.
+# The "lean" profile is for structural checks (headings, alt attributes, links,
+# ScriptData): images, media, fonts and known third-party trackers and map
+# tiles are blocked through CDP Network.setBlockedURLs and navigation returns
+# once the DOM is ready (eager page-load strategy). The "full" profile loads
+# everything and waits for the load event, for tests that need the page as a
+# visitor sees it (currency switching, performance metrics). Blocking is
+# applied per navigation, so one Chrome session can serve both profiles.
+from collections import namedtuple
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+BrowserProfile = namedtuple("BrowserProfile", ["name", "page_load_strategy", "blocked_urls"])
+
+# File types the structural checks never look at; the DOM attributes stay available
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3",
+]
+
+# setBlockedURLs wildcards match the whole URL, so CDN URLs with a query string
+# (e.g. ".../img.png?w=400") need their own pattern
+BLOCKED_RESOURCE_PATTERNS = [pattern for extension in BLOCKED_EXTENSIONS
+                             for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+# Third-party analytics, ads, chat widgets and map tiles
+BLOCKED_THIRD_PARTY_HOSTS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*tiktok.com*",
+    "*maps.googleapis.com*", "*maps.gstatic.com*", "*tile.openstreetmap.org*", "*api.mapbox.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+LEAN = BrowserProfile("lean", "eager", BLOCKED_RESOURCE_PATTERNS + BLOCKED_THIRD_PARTY_HOSTS)
+FULL = BrowserProfile("full", "normal", [])
+PROFILES = {profile.name: profile for profile in (LEAN, FULL)}
+
+
+# Chrome options for a session started with `profile`; headless unless asked otherwise
+def chrome_options(profile=LEAN, headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.page_load_strategy = profile.page_load_strategy
+    return options
+
+
+# Block (or unblock) URLs for the next navigations of the driver
+def apply_profile(driver, profile):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_urls)})
+
+
+# Bypass the HTTP cache for the navigations in the enclosed block, so a page that was
+# loaded before (e.g. with the lean profile) is fetched again as on a first visit
+@contextmanager
+def cold_cache(driver):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    try:
+        yield
+    finally:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+
+
+# Wait for the load event; needed for the full profile in a session started with the eager strategy
+def wait_for_load(driver, timeout=60):
+    WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+
+
+# True when a page loaded with `loaded` can serve a test that asks for `requested`
+def profile_covers(loaded, requested):
+    blocks_no_more = set(loaded.blocked_urls) <= set(requested.blocked_urls)
+    return blocks_no_more and (loaded.page_load_strategy == "normal" or requested.page_load_strategy != "normal")
@@ -0,0 +1,109 @@
+# Change detection between runs of the multi-URL audit.
+# For every tested page the ETag, Last-Modified and a hash of its normalized
+# structure (headings, image alt/src and links parsed from the server HTML)
+# are stored with its results. The next run asks for each page with a
+# conditional request: a 304 Not Modified, or a 200 whose structure hash is
+# unchanged, means the stored results are reused instead of rendering the
+# page again. Client-rendered pages (see static_audit.py) have no usable
+# server-side structure and are always re-tested.
+import hashlib
+import json
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from json_store import load_json, save_json
+from link_checker import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, create_session
+from static_audit import page_data_from_html
+
+DEFAULT_STATE_PATH = "page_state.json"
+
+# Outcome of checking one page; status is "unchanged", "changed" or "error"
+# page_data is the parsed server HTML when the page was downloaded (None if client-rendered)
+PageCheck = namedtuple("PageCheck", ["url", "status", "etag", "last_modified", "dom_hash", "page_data"])
+
+
+# Hash of the parts of the page the H1, heading sequence and image alt checks depend on
+def structure_hash(page_data):
+    normalized = json.dumps([page_data["headings"], page_data["images"], page_data["links"]], separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# Request a page, conditionally when a previous state is given, and compare it with that state
+def check_page(session, url, state=None, timeout=DEFAULT_TIMEOUT):
+    headers = {}
+    if state:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Change check failed for {url}: {e}")
+        return PageCheck(url, "error", None, None, None, None)
+
+    reusable = bool(state and state.get("dom_hash") and state.get("results"))
+    if response.status_code == 304:
+        status = "unchanged" if reusable else "changed"
+        return PageCheck(url, status, state.get("etag"), state.get("last_modified"), state.get("dom_hash"), None)
+    if response.status_code >= 400 or "html" not in response.headers.get("Content-Type", ""):
+        return PageCheck(url, "error", None, None, None, None)
+
+    page_data = page_data_from_html(response.text, response.url)
+    dom_hash = structure_hash(page_data) if page_data is not None else None
+    status = "unchanged" if reusable and dom_hash is not None and dom_hash == state["dom_hash"] else "changed"
+    return PageCheck(url, status, response.headers.get("ETag"), response.headers.get("Last-Modified"), dom_hash, page_data)
+
+
+# Check pages concurrently; `pages` maps a key (the normalized URL) to the URL to request
+# With conditional=False every page is downloaded and reported as changed, to refresh the state
+# Returns {key: PageCheck}
+def detect_changes(pages, store, conditional=True, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    if not pages:
+        return {}
+    session = create_session(concurrency)
+
+    def check(item):
+        key, url = item
+        result = check_page(session, url, store.get(key) if conditional else None, timeout)
+        return key, result
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(pages))) as executor:
+            return dict(executor.map(check, pages.items()))
+    finally:
+        session.close()
+
+
+# On-disk page state: validators, structure hash and results of the last test of each page
+class PageStateStore:
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._pages = load_json(path, "page state")
+
+    def get(self, key):
+        return self._pages.get(key)
+
+    def results(self, key):
+        return self._pages[key]["results"]
+
+    # Links stored with the page, or None if they were not recorded
+    def links(self, key):
+        return self._pages.get(key, {}).get("links")
+
+    # Store the results (and links, when known) of a freshly tested page with the validators of its check
+    def update(self, key, check, results, links=None):
+        self._pages[key] = {
+            "etag": check.etag,
+            "last_modified": check.last_modified,
+            "dom_hash": check.dom_hash,
+            "results": results,
+            "links": links,
+            "tested_at": time.time(),
+        }
+
+    def save(self):
+        save_json(self.path, self._pages)
@@ -0,0 +1,171 @@
+# Declarative check registry and dependency-aware scheduler for test.py.
+# Every check is registered with the resources it needs and the checks it
+# must run after. The scheduler starts a check as soon as those checks have
+# finished and runs independent checks concurrently on a thread pool: checks
+# on the extracted DOM or the network (e.g. link checks) overlap with each
+# other and with browser work, checks that drive the shared browser take
+# turns on it, and a check that changes the page gets a browser of its own.
+# With one worker, checks run one at a time in registration order on the
+# shared page, as before.
+import threading
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+
+from browser_profiles import FULL
+from page_session import PageSession
+
+# What a check needs
+DOM = "dom"  # The extracted page data (headings, images, links, ScriptData)
+BROWSER = "browser"  # Exclusive use of the shared browser page
+NETWORK = "network"  # Outbound requests; never holds the browser
+ISOLATED_PAGE = "isolated_page"  # A page it may change, not shared with other checks
+NEEDS = (DOM, BROWSER, NETWORK, ISOLATED_PAGE)
+
+DEFAULT_WORKERS = 4
+
+# A registered check; func(context) returns a (test name, status, comments) tuple
+Check = namedtuple("Check", ["name", "func", "needs", "after"])
+
+
+class CheckRegistry:
+    def __init__(self):
+        self._checks = {}
+
+    # Decorator registering func(context) as a check
+    def register(self, name, needs=(), after=()):
+        unknown = set(needs) - set(NEEDS)
+        if unknown:
+            raise ValueError(f"Unknown needs for check '{name}': {', '.join(sorted(unknown))}")
+        if name in self._checks:
+            raise ValueError(f"Check '{name}' is already registered")
+
+        def decorator(func):
+            self._checks[name] = Check(name, func, frozenset(needs), tuple(after))
+            return func
+        return decorator
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def __len__(self):
+        return len(self._checks)
+
+    # Checks in registration order, moved after the checks they depend on
+    # Raises ValueError for a dependency on an unknown check or a dependency cycle
+    def ordered(self):
+        ordered, placed, visiting = [], set(), set()
+
+        def place(check):
+            if check.name in placed:
+                return
+            if check.name in visiting:
+                raise ValueError(f"Dependency cycle through check '{check.name}'")
+            visiting.add(check.name)
+            for name in check.after:
+                if name not in self._checks:
+                    raise ValueError(f"Check '{check.name}' runs after unknown check '{name}'")
+                place(self._checks[name])
+            visiting.discard(check.name)
+            placed.add(check.name)
+            ordered.append(check)
+
+        for check in self._checks.values():
+            place(check)
+        return ordered
+
+
+# Shared state handed to every check of one page
+# With isolate, ISOLATED_PAGE checks get their own browser from create_driver; otherwise
+# they use the shared page under the browser lock, and the page is reloaded afterwards
+class CheckContext:
+    def __init__(self, url, page, report, options=None, timings=None, waits=None, create_driver=None, isolate=False):
+        self.url = url
+        self.page = page
+        self.report = report
+        self.options = options
+        self.timings = timings
+        self.waits = waits
+        self.create_driver = create_driver
+        self.isolate = isolate and create_driver is not None
+        self.browser_lock = threading.RLock()
+        self.data_profile = None  # Profile of the load the page data was extracted from
+        self._page_data = None
+
+    # Page data of the URL, extracted once for all DOM checks
+    def page_data(self):
+        with self.browser_lock:
+            if self._page_data is None:
+                self._page_data = self.page.data(self.url)
+                self.data_profile = self.page.profile
+            return self._page_data
+
+    # A page the enclosed block may change freely
+    @contextmanager
+    def isolated_page(self, profile=FULL):
+        if not self.isolate:
+            with self.browser_lock:
+                try:
+                    yield self.page
+                finally:
+                    self.page.invalidate()
+            return
+        driver = self.create_driver()
+        try:
+            yield PageSession(driver, profile, self.waits)
+        finally:
+            driver.quit()
+
+    # Name of the browser profile a check's result was taken with
+    def profile_name(self, check):
+        if ISOLATED_PAGE in check.needs:
+            return FULL.name
+        profile = self.page.profile if BROWSER in check.needs else self.data_profile
+        return profile.name if profile else ""
+
+
+# Run run_check(check) for every check once the checks it comes after have finished
+# Dependencies on checks not in `checks` (e.g. completed in an earlier run) count as met.
+# BROWSER checks hold browser_lock while they run. on_done(check, result) is called on
+# the calling thread in completion order for every check that succeeded. A check that
+# raises skips the checks that run after it, the others still run, and the first
+# exception is re-raised once they have finished.
+def run_checks(checks, run_check, workers=DEFAULT_WORKERS, browser_lock=None, on_done=None):
+    pending = list(checks)
+    names = {check.name for check in pending}
+    done = set()
+    failed = set()
+    errors = []
+    running = {}
+
+    def locked(check):
+        with browser_lock if BROWSER in check.needs and browser_lock is not None else nullcontext():
+            return run_check(check)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="check") as executor:
+        while pending or running:
+            # Checks are in dependency order, so skipping one here also skips the checks after it
+            for check in list(pending):
+                if any(name in failed for name in check.after):
+                    print(f"Skipping {check.name}: {', '.join(name for name in check.after if name in failed)} failed.")
+                    pending.remove(check)
+                    failed.add(check.name)
+                elif all(name in done or name not in names for name in check.after):
+                    pending.remove(check)
+                    running[executor.submit(locked, check)] = check
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                check = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    failed.add(check.name)
+                    continue
+                done.add(check.name)
+                if on_done is not None:
+                    on_done(check, result)
+    if errors:
+        raise errors[0]
@@ -0,0 +1,55 @@
+# Checkpoint journal for long runs.
+# Every completed unit of work (a page in test_script_allURL.py, a test in
+# test.py) is appended to a JSON-lines journal as soon as it finishes and is
+# synced to disk. A run started with --resume reads the journal back, skips
+# the completed work and rebuilds its report from the recorded results.
+import json
+import os
+import threading
+
+
+class CheckpointJournal:
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._completed = {}
+        if resume and os.path.exists(path):
+            self._completed = self._load()
+            print(f"Resuming from '{path}': {len(self._completed)} completed item(s).")
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n")  # Terminate a line cut short by a crash
+
+    # Read completed entries; a line cut short by a crash is ignored
+    def _load(self):
+        completed = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                completed[entry["key"]] = entry["value"]
+        return completed
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def is_done(self, key):
+        return key in self._completed
+
+    def get(self, key):
+        return self._completed[key]
+
+    # Record a completed item; the value must be JSON serializable
+    def record(self, key, value):
+        with self._lock:
+            self._file.write(json.dumps({"key": key, "value": value}, default=str) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._completed[key] = value
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,141 @@
+# Sitemap-driven site crawler for the multi-URL audit.
+# The crawl is seeded from the site's sitemap XML (sitemap indexes are
+# followed) and its HTML site map page, then follows internal links of the
+# pages it has fetched, breadth first, up to a maximum depth. The frontier is
+# de-duplicated by normalized URL and limited to the allowed hosts and a
+# maximum number of pages. Iterating over a SiteCrawler yields each URL as
+# soon as it is discovered while fetching continues in the background, so
+# audit workers (see parallel_runner.py) can start before the crawl ends.
+import queue
+import threading
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from link_checker import DEFAULT_TIMEOUT, create_session
+from static_audit import links_from_html
+from url_utils import normalize_url
+
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_PAGES = 500
+DEFAULT_CONCURRENCY = 8
+SITEMAP_XML_PATH = "/sitemap.xml"
+SITEMAP_PAGE_PATH = "/site-map"
+
+# Links to files rather than pages are never audited
+SKIPPED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico", ".pdf", ".zip",
+                      ".css", ".js", ".json", ".xml", ".txt", ".mp4", ".mp3")
+
+_DONE = object()
+
+
+# <loc> entries of a sitemap XML document; returns (page URLs, nested sitemap URLs)
+def parse_sitemap(xml_text):
+    try:
+        root = ElementTree.fromstring(xml_text)
+    except ElementTree.ParseError:
+        return [], []
+    locs = [element.text.strip() for element in root.iter() if element.tag.endswith("loc") and element.text]
+    if root.tag.endswith("sitemapindex"):
+        return [], locs
+    return locs, []
+
+
+class SiteCrawler:
+    def __init__(self, site_url, max_depth=DEFAULT_MAX_DEPTH, max_pages=DEFAULT_MAX_PAGES, hosts=None,
+                 concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+        self.site_url = site_url
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.hosts = {host.lower() for host in hosts} if hosts else {urlsplit(site_url).hostname.lower()}
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.fetched = 0
+        self._fetched_lock = threading.Lock()
+        self._seen = set()
+        self._output = queue.Queue()
+
+    # Yield page URLs as they are discovered; the crawl runs in a background thread
+    def __iter__(self):
+        threading.Thread(target=self._crawl, name="site-crawler", daemon=True).start()
+        while True:
+            item = self._output.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def _crawl(self):
+        session = create_session(self.concurrency)
+        try:
+            level = [url for url in self._seed_urls(session) if self._admit(url)]
+            depth = 0
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while level and depth < self.max_depth and len(self._seen) < self.max_pages:
+                    next_level = []
+                    for links in executor.map(lambda url: self._fetch_links(session, url), level):
+                        next_level.extend(link for link in links if self._admit(link))
+                    level = next_level
+                    depth += 1
+            print(f"Crawl finished: {len(self._seen)} pages discovered, {self.fetched} fetched.")
+            self._output.put(_DONE)
+        except Exception as e:
+            self._output.put(e)
+        finally:
+            session.close()
+
+    # Start pages: the site root, the sitemap XML entries and the links of the site map page
+    def _seed_urls(self, session):
+        seeds = [self.site_url]
+        sitemaps = [urljoin(self.site_url, SITEMAP_XML_PATH)]
+        while sitemaps and len(seeds) < self.max_pages:
+            response = self._get(session, sitemaps.pop(0))
+            if response is not None:
+                pages, nested = parse_sitemap(response.content)
+                seeds.extend(pages)
+                sitemaps.extend(nested)
+        # The site map page is only audited when the site has one
+        site_map_page = urljoin(self.site_url, SITEMAP_PAGE_PATH)
+        response = self._get(session, site_map_page)
+        if response is not None:
+            seeds.append(site_map_page)
+            seeds.extend(self._links(response))
+        return seeds
+
+    # Add a URL to the frontier and stream it out; False if it is a duplicate or out of bounds
+    def _admit(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or (parts.hostname or "").lower() not in self.hosts:
+            return False
+        if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        key = normalize_url(url)
+        if key in self._seen or len(self._seen) >= self.max_pages:
+            return False
+        self._seen.add(key)
+        self._output.put(url.split("#")[0])
+        return True
+
+    # Links of a page, fetched now
+    def _fetch_links(self, session, url):
+        response = self._get(session, url)
+        return self._links(response) if response is not None else []
+
+    # Links of a fetched page; none unless it is HTML
+    def _links(self, response):
+        if "html" not in response.headers.get("Content-Type", ""):
+            return []
+        with self._fetched_lock:
+            self.fetched += 1
+        return links_from_html(response.text, response.url)
+
+    def _get(self, session, url):
+        try:
+            response = session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Crawler could not fetch {url}: {e}")
+            return None
+        return response if response.status_code < 400 else None
@@ -0,0 +1,128 @@
+# Currency matrix: tests every footer currency independently.
+# The currency list is collected once; each currency is then tested on a fresh
+# page load in its own browser worker (see parallel_runner.py) by selecting
+# that currency directly, and the rows come back in the order of the dropdown.
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from dom_waits import scroll_into_view, wait_for_text
+from parallel_runner import DEFAULT_WORKERS, run_parallel
+from wait_policy import adaptive_wait
+
+CURRENCY_OPTIONS_XPATH = "//div[@class='footer-section']//div[@class='footer-currency-dd']//ul[@class='select-ul']//li"
+
+# Availability price and card prices, read in one call
+READ_PRICES_JS = """
+var availability = document.getElementById('js-default-price');
+return [
+    availability ? availability.innerText.trim() : '',
+    Array.prototype.map.call(document.getElementsByClassName('js-price-value'), function (el) {
+        return el.innerText.trim();
+    })
+];
+"""
+
+# Texts of the currency options, read in one call
+READ_CURRENCIES_JS = """
+return arguments[0].map(function (li) { return li.innerText.trim(); });
+"""
+
+
+# Rows of the "Currency Change Results" sheet for one currency
+def currency_result_rows(currency_text, initial_prices, updated_prices,
+                         initial_availability_price, updated_availability_price, price_update_wait):
+    symbol = currency_text.split()[0]
+    availability_result = "PASS (Currency changed successfully)" if symbol in updated_availability_price else "FAIL (Currency did not change)"
+    rows = []
+    for i in range(len(initial_prices)):
+        updated_price = updated_prices[i] if i < len(updated_prices) else ""
+        card_result = "PASS (Currency changed successfully)" if symbol in updated_price else "FAIL (Currency did not change)"
+        if i == 0:  # Write availability prices only for the first card of the currency
+            rows.append([currency_text, f"Card {i + 1}", initial_prices[i], updated_price, card_result,
+                         initial_availability_price, updated_availability_price, availability_result,
+                         round(price_update_wait, 2)])
+        else:
+            rows.append([currency_text, f"Card {i + 1}", initial_prices[i], updated_price, card_result,
+                         "", "", "", ""])
+    return rows
+
+
+# Wait for the prices to load and return (availability price, card prices)
+# Timeouts come from the WaitPolicy when one is given (see wait_policy.py)
+def read_initial_prices(driver, waits=None):
+    with adaptive_wait(waits, "initial_availability_price", 10) as timeout:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, 'js-default-price')))
+    with adaptive_wait(waits, "initial_card_prices", 10) as timeout:
+        WebDriverWait(driver, timeout).until(EC.presence_of_all_elements_located((By.CLASS_NAME, 'js-price-value')))
+    return driver.execute_script(READ_PRICES_JS)
+
+
+# Scroll to the footer currency dropdown and open it
+def open_currency_dropdown(driver, waits=None):
+    with adaptive_wait(waits, "currency_dropdown_present", 60) as timeout:
+        footer_currency_element = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.ID, 'js-currency-sort-footer'))
+        )
+    scroll_into_view(driver, footer_currency_element)
+    with adaptive_wait(waits, "currency_dropdown_clickable", 60) as timeout:
+        dropdown = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.ID, 'js-currency-sort-footer')))
+    dropdown.click()
+
+
+# Wait until the prices show the currency symbol; returns the seconds it took
+def wait_for_price_update(driver, currency_text, waits=None):
+    with adaptive_wait(waits, "price_update", 60) as timeout:
+        return wait_for_text(driver, ['#js-default-price', '.js-price-value'], currency_text.split()[0], timeout)
+
+
+# Open the dropdown and return the non-empty currency option texts in dropdown order
+def collect_currencies(driver, waits=None):
+    open_currency_dropdown(driver, waits)
+    options = driver.find_elements(By.XPATH, CURRENCY_OPTIONS_XPATH)
+    return [text for text in driver.execute_script(READ_CURRENCIES_JS, options) if text]
+
+
+# Test one currency on a fresh page load; returns its sheet rows
+def test_single_currency(driver, url, currency_text, waits=None):
+    print(f"Testing currency: {currency_text}")
+    driver.get(url)
+    initial_availability_price, initial_prices = read_initial_prices(driver, waits)
+
+    # Select the currency directly by its option text
+    open_currency_dropdown(driver, waits)
+    options = driver.find_elements(By.XPATH, CURRENCY_OPTIONS_XPATH)
+    texts = driver.execute_script(READ_CURRENCIES_JS, options)
+    currency_option = options[texts.index(currency_text)]
+    scroll_into_view(driver, currency_option)
+    try:
+        currency_option.click()
+    except Exception:
+        driver.execute_script("arguments[0].click();", currency_option)
+
+    price_update_wait = wait_for_price_update(driver, currency_text, waits)
+    updated_availability_price, updated_prices = driver.execute_script(READ_PRICES_JS)
+    return currency_result_rows(currency_text, initial_prices, updated_prices,
+                                initial_availability_price, updated_availability_price, price_update_wait)
+
+
+# Report a currency that could not be tested as a single failed row
+def currency_error_rows(currency_text, error):
+    print(f"Error testing currency {currency_text}: {error}")
+    return [[currency_text, "", "", "", f"FAIL (Error: {error})", "", "", "", ""]]
+
+
+# Test every currency on its own page load across `workers` browsers
+# Returns (rows in currency order, number of currencies that errored)
+def run_currency_matrix(url, currencies, create_driver, workers=DEFAULT_WORKERS, waits=None):
+    errors = []
+
+    def on_error(currency_text, error):
+        errors.append(currency_text)
+        return currency_error_rows(currency_text, error)
+
+    results = run_parallel(
+        currencies, lambda driver, currency_text: test_single_currency(driver, url, currency_text, waits),
+        create_driver, workers=workers, on_error=on_error,
+    )
+    return [row for rows in results for row in rows], len(errors)
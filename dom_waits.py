@@ -0,0 +1,68 @@
+# Event-driven waits.
+# Instead of sleeping or polling through WebDriverWait, the wait runs inside the
+# page: a MutationObserver re-checks the condition whenever the DOM changes and
+# execute_async_script returns as soon as it holds. Every wait returns how long
+# it really took, in seconds.
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+# Resolves once the first element of every selector contains the expected text
+WAIT_FOR_TEXT_JS = """
+var selectors = arguments[0], expected = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+function matched() {
+    return selectors.every(function (selector) {
+        var el = document.querySelector(selector);
+        return el !== null && (el.innerText || el.textContent || '').indexOf(expected) !== -1;
+    });
+}
+if (matched()) {
+    done({ok: true});
+    return;
+}
+var finished = false;
+var observer = new MutationObserver(function () {
+    if (!finished && matched()) {
+        finish(true);
+    }
+});
+var timer = setTimeout(function () { finish(matched()); }, timeoutMs);
+function finish(ok) {
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({ok: ok});
+}
+observer.observe(document.documentElement, {subtree: true, childList: true, characterData: true});
+"""
+
+SCROLL_INTO_VIEW_JS = "arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});"
+
+
+# Scroll an element into view; an instant scroll has finished when the call returns
+def scroll_into_view(driver, element):
+    driver.execute_script(SCROLL_INTO_VIEW_JS, element)
+
+
+# Wait until the first element of each CSS selector contains `expected`
+# Returns the seconds the wait took; raises TimeoutException after `timeout` seconds
+def wait_for_text(driver, selectors, expected, timeout):
+    start = time.perf_counter()
+    deadline = start + timeout
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise TimeoutException(f"'{expected}' not found in {selectors} after {timeout}s")
+        driver.set_script_timeout(remaining + 5)
+        try:
+            result = driver.execute_async_script(WAIT_FOR_TEXT_JS, list(selectors), expected, int(remaining * 1000))
+        except JavascriptException as e:
+            # The page navigated while the observer was waiting; wait again on the new document
+            if "unloaded" not in str(e):
+                raise
+            continue
+        elapsed = time.perf_counter() - start
+        if not result["ok"]:
+            raise TimeoutException(f"'{expected}' not found in {selectors} after {elapsed:.2f}s")
+        return elapsed
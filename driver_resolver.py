@@ -0,0 +1,126 @@
+# ChromeDriver resolution without a network round trip on every start.
+# Lookup order:
+#   1. an explicit path (argument or CHROMEDRIVER_PATH environment variable)
+#   2. drivers already cached by webdriver-manager or Selenium Manager whose
+#      major version matches the installed Chrome
+#   3. a matching chromedriver on PATH
+#   4. ChromeDriverManager().install(), unless CHROMEDRIVER_OFFLINE is set
+# The installed Chrome version is read locally from the browser binary.
+import glob
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+DRIVER_NAME = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+# Driver caches of webdriver-manager (~/.wdm) and Selenium Manager (~/.cache/selenium)
+DRIVER_CACHE_PATTERNS = (
+    os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver", "*", "*", "**", DRIVER_NAME),
+    os.path.join(os.path.expanduser("~"), ".cache", "selenium", "chromedriver", "*", "*", DRIVER_NAME),
+)
+
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+
+# Raised when no driver can be found and downloading is not allowed
+class DriverResolutionError(RuntimeError):
+    pass
+
+
+# Parse the first a.b.c.d version in a string into a tuple of ints
+def _parse_version(text):
+    match = VERSION_PATTERN.search(text or "")
+    return tuple(int(part) for part in match.groups()) if match else None
+
+
+def _run_version(binary):
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return _parse_version(output)
+
+
+# Version of the locally installed Chrome, or None if it cannot be determined
+def installed_chrome_version():
+    if sys.platform.startswith("win"):
+        import winreg
+
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                    return _parse_version(winreg.QueryValueEx(key, "version")[0])
+            except OSError:
+                continue
+        return None
+
+    for name in CHROME_BINARIES:
+        binary = shutil.which(name) or (name if os.path.isfile(name) else None)
+        if binary:
+            version = _run_version(binary)
+            if version:
+                return version
+    return None
+
+
+# Cached drivers as (version, path), newest first; the version comes from the cache folder name
+def cached_drivers():
+    drivers = []
+    for pattern in DRIVER_CACHE_PATTERNS:
+        for path in glob.glob(pattern, recursive=True):
+            version = _parse_version(path)
+            if version and os.access(path, os.X_OK):
+                drivers.append((version, path))
+    return sorted(drivers, reverse=True)
+
+
+# Find a chromedriver for the installed Chrome; returns the driver path
+def resolve_chromedriver(explicit_path=None, offline=None):
+    start = time.perf_counter()
+    path, source = _resolve(explicit_path, offline)
+    print(f"Resolved chromedriver from {source} in {time.perf_counter() - start:.2f}s: {path}")
+    return path
+
+
+def _resolve(explicit_path, offline):
+    explicit_path = explicit_path or os.environ.get("CHROMEDRIVER_PATH")
+    if explicit_path:
+        if not os.path.isfile(explicit_path):
+            raise DriverResolutionError(f"chromedriver not found at '{explicit_path}'")
+        return explicit_path, "explicit path"
+
+    chrome_version = installed_chrome_version()
+    chrome_major = chrome_version[0] if chrome_version else None
+
+    for version, path in cached_drivers():
+        if chrome_major is None or version[0] == chrome_major:
+            return path, "local cache"
+
+    on_path = shutil.which(DRIVER_NAME)
+    if on_path:
+        version = _run_version(on_path)
+        if chrome_major is None or (version and version[0] == chrome_major):
+            return on_path, "PATH"
+
+    if offline is None:
+        offline = bool(os.environ.get("CHROMEDRIVER_OFFLINE"))
+    if offline:
+        raise DriverResolutionError(
+            f"No cached chromedriver matches Chrome {chrome_major or 'unknown'}; "
+            "set CHROMEDRIVER_PATH or populate the driver cache"
+        )
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install(), "webdriver-manager download"
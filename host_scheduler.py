@@ -0,0 +1,139 @@
+# Host-aware pacing for outbound link checks.
+# Every host gets a concurrency cap and a token-bucket rate limit, so many
+# hosts can be checked in parallel without hammering any single one. A host
+# that answers 429/503 is paused for its Retry-After time (or an exponential
+# backoff) before any further request to it, and retries across the run are
+# limited by a shared budget so a misbehaving host cannot stall the run.
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from itertools import zip_longest
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_PER_HOST = 8
+DEFAULT_RATE = 10.0  # Requests per second per host
+DEFAULT_RETRY_BUDGET = 50  # Retries per run, across all links
+DEFAULT_MAX_ATTEMPTS = 4  # Attempts per link
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30  # seconds
+MAX_RETRY_AFTER = 60  # Longer Retry-After answers are not waited for
+
+# Stricter limits for hosts known to rate-limit automated clients: (max concurrent, requests/s)
+HOST_LIMITS = {
+    "facebook.com": (1, 1.0),
+    "instagram.com": (1, 1.0),
+    "x.com": (1, 1.0),
+    "twitter.com": (1, 1.0),
+    "linkedin.com": (1, 0.5),
+}
+
+
+# Lower-case host name of a URL; "" when it has none or cannot be parsed (e.g. "https://[::1/")
+def host_of(url):
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class _HostState:
+    def __init__(self, max_concurrency, rate):
+        self.semaphore = threading.Semaphore(max_concurrency)
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    # Wait until the host is not paused and a token is available, then take it
+    def take_token(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostScheduler:
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, rate=DEFAULT_RATE, retry_budget=DEFAULT_RETRY_BUDGET,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, host_limits=HOST_LIMITS):
+        self.max_per_host = max_per_host
+        self.rate = rate
+        self.retry_budget = retry_budget
+        self.max_attempts = max_attempts
+        self.host_limits = host_limits
+        self.retries = 0
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(*self._limits(host))
+            return self._hosts[host]
+
+    # Limits for a host; entries in host_limits also cover their subdomains
+    def _limits(self, host):
+        for domain, limits in self.host_limits.items():
+            if host == domain or host.endswith("." + domain):
+                return limits
+        return self.max_per_host, self.rate
+
+    # Hold one of the host's connection slots and one of its rate tokens for the enclosed request
+    @contextmanager
+    def slot(self, url):
+        state = self._host(host_of(url))
+        with state.semaphore:
+            state.take_token()
+            yield
+
+    # Pause all requests to the URL's host for `seconds`
+    def pause(self, url, seconds):
+        state = self._host(host_of(url))
+        with state.lock:
+            state.blocked_until = max(state.blocked_until, time.monotonic() + seconds)
+
+    # Take a retry from the run's budget; False when the budget is spent or the link is out of attempts
+    def take_retry(self, attempt):
+        with self._lock:
+            if attempt >= self.max_attempts or self.retries >= self.retry_budget:
+                return False
+            self.retries += 1
+            return True
+
+
+# Exponential backoff with jitter for the given attempt (1 for the first retry)
+def backoff_delay(attempt):
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+# Seconds to wait from a Retry-After header (delta seconds or an HTTP date), or None
+def retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Order URLs round-robin by host, so a worker pool is not filled with links to one host
+def interleave_by_host(urls):
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(host_of(url), []).append(url)
+    return [url for group in zip_longest(*by_host.values()) for url in group if url is not None]
@@ -0,0 +1,203 @@
+# Lightweight run instrumentation.
+# RunTimings records, per test: wall time, navigation time, number of
+# WebDriver commands, time spent in explicit waits and time spent in report
+# I/O. The driver is instrumented by wrapping its execute() method, explicit
+# waits by wrapping WebDriverWait.until, and the report by wrapping its write
+# methods. Asynchronous scripts only ever wait for the page here (the
+# MutationObserver waits in dom_waits.py, the load wait in perf_metrics.py),
+# so instrumented drivers time them as waits too.
+# Results go to a "Timings" sheet and a JSON sidecar file. MemorySampler
+# tracks the peak memory of a run including its browser processes.
+import cProfile
+import functools
+import json
+import math
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.wait import WebDriverWait
+
+try:
+    import psutil
+except ImportError:  # Optional; without it only the getrusage() peaks are available
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+TIMING_HEADERS = ["Test", "Wall (s)", "Navigation (s)", "WebDriver Commands", "Waits (s)", "Link Checks (s)", "Report I/O (s)"]
+CATEGORIES = ("navigation", "commands", "waits", "link_checks", "report_io")
+
+
+class RunTimings:
+    def __init__(self):
+        self.totals = dict.fromkeys(CATEGORIES, 0)
+        self.tests = []
+        self._lock = threading.Lock()
+
+    # Add an amount to a category total (seconds, or a count for "commands")
+    def add(self, category, amount):
+        with self._lock:
+            self.totals[category] += amount
+
+    # Time the enclosed block into a category
+    @contextmanager
+    def measure(self, category):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, time.perf_counter() - start)
+
+    # Record wall time and the category totals accrued while the enclosed test ran
+    @contextmanager
+    def test(self, name):
+        before = dict(self.totals)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"test": name, "wall": time.perf_counter() - start}
+            record.update({category: self.totals[category] - before[category] for category in CATEGORIES})
+            self.tests.append(record)
+
+    # Count every WebDriver command issued through the driver, time navigations and asynchronous-script waits
+    def instrument_driver(self, driver):
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def timed_execute(command, params=None):
+            self.add("commands", 1)
+            if command == Command.GET:
+                category = "navigation"
+            elif command == Command.W3C_EXECUTE_SCRIPT_ASYNC:
+                category = "waits"
+            else:
+                return execute(command, params)
+            with self.measure(category):
+                return execute(command, params)
+
+        driver.execute = timed_execute
+        return driver
+
+    # Time every WebDriverWait.until call in this process
+    def instrument_waits(self):
+        until = WebDriverWait.until
+        timings = self
+
+        @functools.wraps(until)
+        def timed_until(wait, method, message=""):
+            with timings.measure("waits"):
+                return until(wait, method, message)
+
+        WebDriverWait.until = timed_until
+
+    # Time the report's write calls as report I/O
+    def instrument_report(self, report):
+        for name in ("create_sheet", "append", "replay", "close"):
+            method = getattr(report, name)
+            setattr(report, name, self._timed(method, "report_io"))
+        return report
+
+    def _timed(self, method, category):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            with self.measure(category):
+                return method(*args, **kwargs)
+        return timed
+
+    # Rows for the "Timings" sheet: one per test plus a total row
+    def rows(self):
+        rows = [[record["test"], round(record["wall"], 3), round(record["navigation"], 3), record["commands"],
+                 round(record["waits"], 3), round(record["link_checks"], 3), round(record["report_io"], 3)]
+                for record in self.tests]
+        wall = sum(record["wall"] for record in self.tests)
+        rows.append(["Total", round(wall, 3), round(self.totals["navigation"], 3), self.totals["commands"],
+                     round(self.totals["waits"], 3), round(self.totals["link_checks"], 3), round(self.totals["report_io"], 3)])
+        return rows
+
+    def write_sheet(self, report):
+        sheet = report.create_sheet("Timings", TIMING_HEADERS)
+        for row in self.rows():
+            sheet.append(row)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tests": self.tests, "totals": self.totals}, f, indent=2)
+
+
+# Nearest-rank percentile of a list of numbers
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+# Peak resident set size in MB of this process (who="self") or of its finished children (e.g. Chrome)
+def peak_rss_mb(who="self"):
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    return round(usage.ru_maxrss / divisor, 1)
+
+
+# Samples the combined RSS of this process and all its descendants (chromedriver, Chrome and its
+# renderers) in a background thread while the enclosed block runs. Pages shared between processes
+# count once per process, so compare peaks between runs rather than reading them as exact totals.
+# Needs psutil; without it peak_mb stays None and peak_rss() falls back to getrusage().
+class MemorySampler:
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        process = psutil.Process()
+        while True:
+            total = 0
+            for proc in [process] + process.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass  # The process exited between listing and reading
+            self.peak_mb = max(self.peak_mb or 0, round(total / (1024 * 1024), 1))
+            if self._stop.wait(self.interval):
+                return
+
+    # Sampled peak in MB, or without psutil that of the largest single process (Python or a finished browser process)
+    def peak_rss(self):
+        if self.peak_mb is not None:
+            return self.peak_mb
+        return max(filter(None, [peak_rss_mb("self"), peak_rss_mb("children")]), default=None)
+
+
+# Run the enclosed block under cProfile, save the stats to `path` and print the top entries
+@contextmanager
+def profiled(path, top=20):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile saved to '{path}'.")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
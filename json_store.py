@@ -0,0 +1,27 @@
+# JSON state files kept between runs (link cache, wait history, page state).
+# A missing or unreadable file reads as empty, so a run never fails on stale
+# state, and files are written to a temporary file first and then renamed
+# over the old one, so an interrupted run cannot leave a truncated file.
+import json
+import os
+
+
+# Read a JSON object from `path`; {} when the file is missing or unreadable
+# `description` names the file in the warning, e.g. "link cache"
+def load_json(path, description):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable {description} '{path}': {e}")
+        return {}
+
+
+# Write `data` to `path` atomically
+def save_json(path, data):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
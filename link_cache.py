@@ -0,0 +1,52 @@
+# Persistent on-disk cache of link check results.
+# Results are keyed by normalized URL and reused across runs until they are
+# older than the TTL; the file is bounded to max_entries by dropping the
+# oldest checks first. Request errors and rate-limit or server errors are never cached.
+import time
+
+from json_store import load_json, save_json
+from link_checker import LinkResult
+from url_utils import normalize_url
+
+DEFAULT_CACHE_PATH = "link_status_cache.json"
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class LinkCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, bypass=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._entries = load_json(path, "link cache")
+
+    # Return the cached result for the URL, or None if it is missing or stale
+    def get(self, url):
+        if self.bypass:
+            return None
+        entry = self._entries.get(normalize_url(url))
+        if entry is None or time.time() - entry["checked_at"] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return LinkResult(url, entry["status_code"], entry["final_url"], None)
+
+    # Store a fresh result; request errors, 429s and 5xx answers are left out so they are retried next run
+    def put(self, result):
+        if result.error is not None or result.status_code == 429 or result.status_code >= 500:
+            return
+        self._entries[normalize_url(result.url)] = {
+            "status_code": result.status_code,
+            "final_url": result.final_url,
+            "checked_at": time.time(),
+        }
+
+    # Write the cache back to disk, keeping only the newest max_entries results
+    def save(self):
+        if len(self._entries) > self.max_entries:
+            newest = sorted(self._entries.items(), key=lambda item: item[1]["checked_at"], reverse=True)
+            self._entries = dict(newest[:self.max_entries])
+        save_json(self.path, self._entries)
@@ -0,0 +1,125 @@
+# Concurrent link checker used by the URL Status Code test.
+# Links are checked by a bounded thread pool sharing one pooled requests.Session,
+# so connections to the same host are kept alive and reused, and every request
+# has a timeout so a single slow host cannot stall the run. Requests are paced
+# per host by a HostScheduler (see host_scheduler.py), which also decides when
+# rate-limited or failed checks are retried.
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from host_scheduler import MAX_RETRY_AFTER, HostScheduler, backoff_delay, interleave_by_host, retry_after_seconds
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = (5, 10)  # (connect, read) seconds
+
+# HEAD answers that often mean "HEAD not supported" rather than a broken link; re-checked with GET
+HEAD_REJECTED = (403, 405, 501)
+# Answers worth retrying after a pause
+RETRY_STATUSES = (429, 503)
+
+# Outcome of checking one link; error is set when no response was received
+LinkResult = namedtuple("LinkResult", ["url", "status_code", "final_url", "error"])
+
+
+# Create a session whose connection pool matches the checker concurrency
+def create_session(concurrency=DEFAULT_CONCURRENCY):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Request a link once: HEAD, or a streamed GET closed after the headers when HEAD is rejected
+def _request_link(session, url, timeout):
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    if response.status_code in HEAD_REJECTED:
+        response = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+        response.close()
+    return response
+
+
+# Check a single link, following redirects, paced and retried by the scheduler
+# 429/503 answers pause the host for its Retry-After time (or a backoff) before retrying;
+# request errors are retried after a backoff while the scheduler's retry budget lasts
+def check_link(session, url, timeout=DEFAULT_TIMEOUT, scheduler=None):
+    scheduler = scheduler or HostScheduler()
+    attempt = 1
+    while True:
+        with scheduler.slot(url):
+            try:
+                response = _request_link(session, url, timeout)
+                result, error = LinkResult(url, response.status_code, response.url, None), None
+            except requests.RequestException as e:
+                response, result, error = None, LinkResult(url, None, None, str(e)), e
+
+        if response is not None and response.status_code in RETRY_STATUSES:
+            delay = retry_after_seconds(response.headers.get("Retry-After")) or backoff_delay(attempt)
+            if delay > MAX_RETRY_AFTER or not scheduler.take_retry(attempt):
+                return result
+            scheduler.pause(url, delay)
+        elif isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            if not scheduler.take_retry(attempt):
+                return result
+            time.sleep(backoff_delay(attempt))
+        else:
+            return result
+        attempt += 1
+
+
+# Check links concurrently; returns {url: LinkResult} with each distinct URL checked once
+# When a LinkCache is given, fresh cached results are reused and new results stored
+# Links are checked round-robin by host; pass a HostScheduler to share pacing across calls
+def check_links(urls, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, session=None, cache=None, scheduler=None):
+    results = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        else:
+            pending.append(url)
+    if not pending:
+        return results
+
+    own_session = session is None
+    if own_session:
+        session = create_session(concurrency)
+    scheduler = scheduler or HostScheduler()
+    try:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(pending))) as executor:
+            for result in executor.map(lambda url: check_link(session, url, timeout, scheduler), interleave_by_host(pending)):
+                results[result.url] = result
+                if cache is not None:
+                    cache.put(result)
+    finally:
+        if own_session:
+            session.close()
+    return results
+
+
+# "URL Status" comment for a broken link, or None when the link is fine
+def link_status_comment(result):
+    if result.error is not None:
+        return f"Request error: {result.error}"
+    if result.status_code == 404:
+        return "404 Not Found"
+    return None
+
+
+# Build "URL Status" sheet rows ([URL, Status, Comments]) for the links of a page
+# Only broken links, request errors and empty hrefs are logged, in page order
+def url_status_rows(hrefs, results):
+    rows = []
+    for href in hrefs:
+        if not href:
+            rows.append(["Empty Link", "Fail", "No href attribute found"])
+            continue
+        comment = link_status_comment(results[href])
+        if comment is not None:
+            rows.append([href, "Fail", comment])
+    return rows
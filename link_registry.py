@@ -0,0 +1,94 @@
+# Run-scoped link registry for site-wide link audits.
+# Header, footer and social links repeat on every page; the registry checks
+# each unique target (by normalized URL) once per run, in the background, and
+# hands every later request for it the same future, so concurrent pages
+# asking for the same link share one in-flight check. A reverse index from
+# each link to the pages it was found on lets the "URL Status" sheet list
+# every page a broken link appears on.
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from host_scheduler import HostScheduler
+from link_checker import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, check_link, create_session, link_status_comment
+from url_utils import normalize_url
+
+LINK_STATUS_HEADERS = ["URL", "Status", "Comments", "Found On"]
+
+
+class LinkRegistry:
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, cache=None, scheduler=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler or HostScheduler()
+        self.pages = {}  # Page URL -> its hrefs (None for anchors without href)
+        self.occurrences = 0
+        self._session = create_session(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._lock = threading.Lock()
+        self._checks = {}  # Normalized URL -> Future of its LinkResult
+        self._referrers = {}  # Normalized URL -> {page URL: None}, in discovery order
+        self._empty_links = {}  # Page URL -> number of anchors without href
+
+    # Check a link once per run; returns the Future of its LinkResult
+    def check(self, url, referrer=None):
+        key = normalize_url(url)
+        with self._lock:
+            self.occurrences += 1
+            if referrer is not None:
+                self._referrers.setdefault(key, {})[referrer] = None
+            future = self._checks.get(key)
+            if future is None:
+                cached = self.cache.get(url) if self.cache is not None else None
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+                else:
+                    future = self._executor.submit(self._check, url)
+                self._checks[key] = future
+            return future
+
+    def _check(self, url):
+        result = check_link(self._session, url, self.timeout, self.scheduler)
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
+
+    # Register the links of a page; their checks run in the background
+    def add_page(self, page_url, hrefs):
+        with self._lock:
+            self.pages[page_url] = list(hrefs)
+            empty = sum(1 for href in hrefs if not href)
+            if empty:
+                self._empty_links[page_url] = empty
+        for href in hrefs:
+            if href:
+                self.check(href, page_url)
+
+    # Number of distinct links checked (or taken from the cache) this run
+    @property
+    def unique_links(self):
+        return len(self._checks)
+
+    # Wait for every check submitted so far
+    def wait(self):
+        with self._lock:
+            futures = list(self._checks.values())
+        wait(futures)
+
+    # "URL Status" rows ([URL, Status, Comments, Found On]): one per broken link, with every page it is on
+    def broken_link_rows(self):
+        self.wait()
+        rows = []
+        for key, future in self._checks.items():
+            result = future.result()
+            comment = link_status_comment(result)
+            if comment is not None:
+                rows.append([result.url, "Fail", comment, "\n".join(self._referrers.get(key, ()))])
+        if self._empty_links:
+            pages = "\n".join(f"{page} ({count})" for page, count in self._empty_links.items())
+            rows.append(["Empty Link", "Fail", "No href attribute found", pages])
+        return rows
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._session.close()
@@ -0,0 +1,43 @@
+# Batched DOM extraction.
+# One execute_script call collects everything the read-only checks need, so a
+# page with hundreds of images or links costs a single WebDriver round trip
+# instead of one per element and attribute.
+import json
+
+EXTRACT_PAGE_DATA_JS = """
+var map = Array.prototype.map;
+var headings = map.call(document.querySelectorAll('h1, h2, h3, h4, h5, h6'), function (h) {
+    return parseInt(h.tagName.charAt(1), 10);
+});
+var images = map.call(document.querySelectorAll('img'), function (img) {
+    return [img.getAttribute('alt'), img.src || img.getAttribute('src')];
+});
+var links = document.body ? map.call(document.body.querySelectorAll('a'), function (a) {
+    return a.hasAttribute('href') ? a.href : null;
+}) : [];
+var scriptData = null;
+if (typeof ScriptData !== 'undefined' && ScriptData) {
+    var config = ScriptData.config || {};
+    var pageData = ScriptData.pageData || {};
+    var userInfo = ScriptData.userInfo || {};
+    scriptData = {
+        config: {SiteUrl: config.SiteUrl, SiteName: config.SiteName},
+        pageData: {CampaignId: pageData.CampaignId},
+        userInfo: {Browser: userInfo.Browser, CountryCode: userInfo.CountryCode, IP: userInfo.IP}
+    };
+}
+return JSON.stringify({headings: headings, images: images, links: links, scriptData: scriptData});
+"""
+
+
+# Collect headings, images, anchors and ScriptData from the loaded page
+# Returns {"headings": [1, 2, ...], "images": [[alt, src], ...],
+#          "links": [href or None, ...], "script_data": {...} or None}
+def extract_page_data(driver):
+    raw = json.loads(driver.execute_script(EXTRACT_PAGE_DATA_JS))
+    return {
+        "headings": raw["headings"],
+        "images": raw["images"],
+        "links": raw["links"],
+        "script_data": raw["scriptData"],
+    }
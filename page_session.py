@@ -0,0 +1,49 @@
+from browser_profiles import apply_profile, profile_covers, wait_for_load
+from page_extract import extract_page_data
+from wait_policy import adaptive_wait
+
+
+# Page session shared by the checks in test.py.
+# The page is loaded once per URL and every read-only check reuses that load;
+# checks that change the page (e.g. the currency switch) call invalidate()
+# afterwards so the next check navigates again. With browser profiles (see
+# browser_profiles.py) a load is reused only when its profile covers the one
+# requested, e.g. a lean load is reloaded for a test that needs the full page.
+class PageSession:
+    def __init__(self, driver, profile=None, waits=None):
+        self.driver = driver
+        self.default_profile = profile
+        self.waits = waits
+        self.url = None
+        self.profile = None  # Profile of the current load
+        self.load_count = 0
+        self._page_data = None
+
+    # Navigate to the URL unless it is already the loaded page
+    def load(self, url, profile=None):
+        profile = profile or self.default_profile
+        stale = profile is not None and (self.profile is None or not profile_covers(self.profile, profile))
+        if self.url != url or stale:
+            if profile is not None and profile != self.profile:
+                apply_profile(self.driver, profile)
+            self.driver.get(url)
+            if profile is not None and profile.page_load_strategy == "normal":
+                with adaptive_wait(self.waits, "page_load", 60) as timeout:
+                    wait_for_load(self.driver, timeout)
+            self.url = url
+            self.profile = profile
+            self.load_count += 1
+            self._page_data = None
+        return self.driver
+
+    # Headings, images, links and ScriptData of the loaded page, extracted once per load
+    def data(self, url):
+        self.load(url)
+        if self._page_data is None:
+            self._page_data = extract_page_data(self.driver)
+        return self._page_data
+
+    # Forget the loaded page so the next load() navigates again
+    def invalidate(self):
+        self.url = None
+        self._page_data = None
@@ -0,0 +1,53 @@
+# Parallel runner: spreads work items across a pool of browser workers.
+# Each worker thread owns its own WebDriver and pulls the next item from a
+# shared iterator as soon as it is free, so a slow page only holds up the
+# worker that loads it. Results come back in input order.
+import threading
+
+DEFAULT_WORKERS = 4
+
+
+# Run job(driver, item) for every item using `workers` drivers from create_driver()
+# Failed items get on_error(item, exception) as their result (the exception is
+# re-raised when no on_error is given). Returns the results in input order.
+def run_parallel(items, job, create_driver, workers=DEFAULT_WORKERS, on_error=None):
+    source = enumerate(items)
+    source_lock = threading.Lock()
+    results = {}
+    errors = []
+
+    # Take the next (index, item) pair, or None when the input is exhausted
+    def next_item():
+        with source_lock:
+            return next(source, None)
+
+    def worker():
+        driver = None
+        try:
+            while not errors:
+                entry = next_item()
+                if entry is None:
+                    break
+                index, item = entry
+                try:
+                    if driver is None:
+                        driver = create_driver()
+                    results[index] = job(driver, item)
+                except Exception as e:
+                    if on_error is None:
+                        errors.append(e)
+                        break
+                    results[index] = on_error(item, e)
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    threads = [threading.Thread(target=worker, name=f"browser-worker-{i + 1}") for i in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return [results[index] for index in sorted(results)]
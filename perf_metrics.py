@@ -0,0 +1,132 @@
+# Page performance metrics for the already-loaded page.
+# Reads Navigation Timing, Resource Timing and buffered PerformanceObserver
+# entries in one execute_async_script call: TTFB, DOMContentLoaded, load,
+# Largest Contentful Paint, Cumulative Layout Shift and total transferred
+# bytes. Each metric is compared with a configurable threshold for Pass/Fail.
+
+# Default thresholds (milliseconds, except CLS and bytes); TTFB, LCP and CLS
+# follow the Core Web Vitals "good" limits
+DEFAULT_THRESHOLDS = {
+    "ttfb": 800,
+    "dom_content_loaded": 2500,
+    "load": 5000,
+    "lcp": 2500,
+    "cls": 0.1,
+    "transfer_bytes": 5000000,
+}
+
+METRIC_LABELS = {
+    "ttfb": "TTFB",
+    "dom_content_loaded": "DOMContentLoaded",
+    "load": "Load",
+    "lcp": "LCP",
+    "cls": "CLS",
+    "transfer_bytes": "Transferred bytes",
+}
+
+PERFORMANCE_HEADERS = ["URL", "TTFB (ms)", "DOMContentLoaded (ms)", "Load (ms)", "LCP (ms)", "CLS",
+                       "Transferred (KB)", "Status", "Comments"]
+
+COLLECT_METRICS_JS = """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+function observed(type) {
+    var entries = [];
+    try {
+        var observer = new PerformanceObserver(function (list) { entries.push.apply(entries, list.getEntries()); });
+        observer.observe({type: type, buffered: true});
+        return {entries: entries, observer: observer};
+    } catch (e) {
+        return {entries: entries, observer: null};
+    }
+}
+function collect() {
+    var lcp = observed('largest-contentful-paint');
+    var shifts = observed('layout-shift');
+    // Buffered entries are delivered asynchronously
+    setTimeout(function () {
+        [lcp, shifts].forEach(function (o) { if (o.observer) { o.observer.disconnect(); } });
+        var nav = performance.getEntriesByType('navigation')[0];
+        var resources = performance.getEntriesByType('resource');
+        var transferred = nav ? nav.transferSize || 0 : 0;
+        resources.forEach(function (r) { transferred += r.transferSize || 0; });
+        var cls = 0;
+        shifts.entries.forEach(function (s) { if (!s.hadRecentInput) { cls += s.value; } });
+        var lastLcp = lcp.entries.length ? lcp.entries[lcp.entries.length - 1] : null;
+        done({
+            ttfb: nav ? nav.responseStart - nav.startTime : null,
+            dom_content_loaded: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd - nav.startTime : null,
+            load: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+            lcp: lastLcp ? lastLcp.renderTime || lastLcp.startTime : null,
+            cls: shifts.observer ? cls : null,
+            transfer_bytes: transferred
+        });
+    }, 100);
+}
+if (document.readyState === 'complete') {
+    setTimeout(collect, 0);  // Let loadEventEnd be recorded
+} else {
+    var started = false;
+    var start = function () { if (!started) { started = true; setTimeout(collect, 0); } };
+    window.addEventListener('load', start);
+    setTimeout(start, timeoutMs);
+}
+"""
+
+
+# Collect the metrics of the page currently loaded in the driver (waits up to `timeout` for load)
+def collect_page_metrics(driver, timeout=10):
+    driver.set_script_timeout(timeout + 5)
+    return driver.execute_async_script(COLLECT_METRICS_JS, int(timeout * 1000))
+
+
+# Compare metrics with thresholds; returns ("Pass" | "Fail", comments)
+# Metrics the browser could not measure are reported but do not fail the page
+def evaluate_metrics(metrics, thresholds=DEFAULT_THRESHOLDS):
+    failures = []
+    missing = []
+    for name, limit in thresholds.items():
+        value = metrics.get(name)
+        if value is None:
+            missing.append(METRIC_LABELS[name])
+        elif value > limit:
+            failures.append(f"{METRIC_LABELS[name]} {_format(name, value)} > {_format(name, limit)}")
+    comments = "; ".join(failures) if failures else "All metrics within thresholds"
+    if missing:
+        comments += f" (not measured: {', '.join(missing)})"
+    return ("Fail" if failures else "Pass"), comments
+
+
+def _format(name, value):
+    if name == "cls":
+        return f"{value:.3f}"
+    if name == "transfer_bytes":
+        return f"{value / 1024:.0f} KB"
+    return f"{value:.0f} ms"
+
+
+# Row values for the "Page Performance" sheet (everything after the URL column)
+def performance_row(metrics, thresholds=DEFAULT_THRESHOLDS):
+    status, comments = evaluate_metrics(metrics, thresholds)
+
+    def rounded(name, digits=0):
+        value = metrics.get(name)
+        return None if value is None else round(value, digits)
+
+    transfer_bytes = metrics.get("transfer_bytes")
+    return [
+        rounded("ttfb"), rounded("dom_content_loaded"), rounded("load"), rounded("lcp"), rounded("cls", 4),
+        None if transfer_bytes is None else round(transfer_bytes / 1024, 1),
+        status, comments,
+    ]
+
+
+# Parse NAME=VALUE threshold overrides, e.g. ["lcp=3000", "cls=0.25"]
+def parse_thresholds(overrides):
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for override in overrides or []:
+        name, _, value = override.partition("=")
+        if name not in thresholds:
+            raise ValueError(f"Unknown performance metric '{name}', expected one of {', '.join(thresholds)}")
+        thresholds[name] = float(value)
+    return thresholds
@@ -0,0 +1,79 @@
+# Streaming report writer.
+# Rows are passed to the result sinks (see result_sinks.py) as they are
+# produced, so report I/O stays constant per row instead of re-serializing
+# the whole workbook after every test; the Excel sink writes its file once
+# at the end. Unless a JSONL stream is requested anyway, every row also goes
+# to a crash-safe partial log that is removed when the report completes and
+# can otherwise be turned into a report with result_sinks.build_excel_from_jsonl().
+# Writes are serialized, so checks running on several threads can share one report.
+import os
+import threading
+
+from result_sinks import JsonlSink, create_sinks
+
+
+# Sheet handle returned by StreamingReport.create_sheet()
+class ReportSheet:
+    def __init__(self, report, title):
+        self.report = report
+        self.title = title
+
+    def append(self, row):
+        self.report.append(self.title, row)
+
+
+class StreamingReport:
+    def __init__(self, base_path, formats=("excel",)):
+        self.base_path = base_path
+        self.sinks = create_sinks(base_path, formats)
+        self.partial_log = None
+        if "jsonl" not in formats:
+            self.partial_log = JsonlSink(base_path + ".partial.jsonl")
+            self.sinks.append(self.partial_log)
+        self._lock = threading.Lock()
+        self._captures = {}  # Thread id -> events captured on that thread
+
+    # Create a sheet with a header row in every sink
+    def create_sheet(self, title, headers):
+        with self._lock:
+            for sink in self.sinks:
+                sink.open_sheet(title, headers)
+            self._capture(["sheet", title, list(headers)])
+        return ReportSheet(self, title)
+
+    # Append a row to a sheet in every sink
+    def append(self, title, row):
+        with self._lock:
+            for sink in self.sinks:
+                sink.write_row(title, row)
+            self._capture(["row", title, list(row)])
+
+    def _capture(self, event):
+        captured = self._captures.get(threading.get_ident())
+        if captured is not None:
+            captured.append(event)
+
+    # Collect the sheets and rows this thread writes from now on, e.g. to checkpoint one test
+    def begin_capture(self):
+        with self._lock:
+            self._captures[threading.get_ident()] = []
+
+    # Stop collecting and return this thread's captured ["sheet" | "row", title, values] events
+    def end_capture(self):
+        with self._lock:
+            return self._captures.pop(threading.get_ident(), None)
+
+    # Write captured events again, e.g. when a resumed run skips a completed test
+    def replay(self, events):
+        for kind, title, values in events:
+            if kind == "sheet":
+                self.create_sheet(title, values)
+            else:
+                self.append(title, values)
+
+    # Finish every sink; the partial log is removed once the report is complete
+    def close(self, complete=True):
+        for sink in self.sinks:
+            sink.close()
+        if complete and self.partial_log is not None:
+            os.remove(self.partial_log.path)
@@ -0,0 +1,177 @@
+# Result sinks used by the streaming report.
+# Every sink receives the same stream of sheets and rows:
+#   open_sheet(title, headers), write_row(title, row), close()
+# JSONL and CSV sinks write each row as it arrives, the Parquet sink writes
+# row groups in batches (only when pyarrow is installed) and the Excel sink
+# keeps the original TestReports_All.xlsx layout. An Excel report can also be
+# built afterwards from a JSONL stream with build_excel_from_jsonl().
+import csv
+import json
+import os
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+SINK_FORMATS = ("excel", "jsonl", "csv", "parquet")
+
+
+# One JSON object per line: {"sheet", "headers"} when a sheet opens, {"sheet", "row"} per row
+class JsonlSink:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def open_sheet(self, title, headers):
+        self._write({"sheet": title, "headers": list(headers)})
+
+    def write_row(self, title, row):
+        self._write({"sheet": title, "row": list(row)})
+
+    # Flushed per record so the stream survives a crash
+    def _write(self, record):
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+# One CSV file per sheet inside a directory
+class CsvSink:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}
+        self._writers = {}
+
+    def open_sheet(self, title, headers):
+        f = open(os.path.join(self.directory, f"{title}.csv"), "w", encoding="utf-8", newline="")
+        self._files[title] = f
+        self._writers[title] = csv.writer(f)
+        self._writers[title].writerow(headers)
+
+    def write_row(self, title, row):
+        self._writers[title].writerow(row)
+        self._files[title].flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+# One Parquet file per sheet inside a directory; all columns are stored as strings
+# Values beyond the header row (e.g. an error message on an N/A row) are dropped
+class ParquetSink:
+    def __init__(self, directory, batch_size=10000):
+        if pyarrow is None:
+            raise RuntimeError("The Parquet sink requires pyarrow (pip install pyarrow)")
+        self.directory = directory
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        self._schemas = {}
+        self._writers = {}
+        self._batches = {}
+
+    def open_sheet(self, title, headers):
+        schema = pyarrow.schema([(str(header), pyarrow.string()) for header in headers])
+        self._schemas[title] = schema
+        self._writers[title] = parquet.ParquetWriter(os.path.join(self.directory, f"{title}.parquet"), schema)
+        self._batches[title] = []
+
+    def write_row(self, title, row):
+        width = len(self._schemas[title])
+        values = [None if value is None else str(value) for value in list(row)[:width]]
+        self._batches[title].append(values + [None] * (width - len(values)))
+        if len(self._batches[title]) >= self.batch_size:
+            self._flush(title)
+
+    def _flush(self, title):
+        rows = self._batches[title]
+        if rows:
+            columns = [pyarrow.array(column, type=pyarrow.string()) for column in zip(*rows)]
+            self._writers[title].write_table(pyarrow.Table.from_arrays(columns, schema=self._schemas[title]))
+            self._batches[title] = []
+
+    def close(self):
+        for title, writer in self._writers.items():
+            self._flush(title)
+            writer.close()
+
+
+# The original Excel layout: one sheet per result table with a bold header row
+class ExcelSink:
+    def __init__(self, path):
+        self.path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheets = {}
+
+    def open_sheet(self, title, headers):
+        worksheet = self._workbook.create_sheet(title=title)
+        worksheet.append([_bold_cell(worksheet, header) for header in headers])
+        self._sheets[title] = worksheet
+
+    def write_row(self, title, row):
+        self._sheets[title].append(row)
+
+    def close(self):
+        self._workbook.save(self.path)
+
+
+def _bold_cell(worksheet, value):
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.font = Font(bold=True)
+    return cell
+
+
+# Create sinks for the requested formats, named after base_path (e.g. "TestReports_All")
+def create_sinks(base_path, formats):
+    sinks = []
+    for name in formats:
+        if name == "excel":
+            sinks.append(ExcelSink(base_path + ".xlsx"))
+        elif name == "jsonl":
+            sinks.append(JsonlSink(base_path + ".jsonl"))
+        elif name == "csv":
+            sinks.append(CsvSink(base_path + "_csv"))
+        elif name == "parquet":
+            sinks.append(ParquetSink(base_path + "_parquet"))
+        else:
+            raise ValueError(f"Unknown result format '{name}', expected one of {', '.join(SINK_FORMATS)}")
+    return sinks
+
+
+# Replay a JSONL stream into other sinks; a line cut short by a crash ends the replay
+def replay_jsonl(path, sinks):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            for sink in sinks:
+                if "headers" in record:
+                    sink.open_sheet(record["sheet"], record["headers"])
+                else:
+                    sink.write_row(record["sheet"], record["row"])
+    for sink in sinks:
+        sink.close()
+
+
+# Build the Excel report from a JSONL stream (a finished run or a crashed run's partial log)
+def build_excel_from_jsonl(jsonl_path, xlsx_path):
+    replay_jsonl(jsonl_path, [ExcelSink(xlsx_path)])
+
+
+# Usage: python result_sinks.py TestReports_All.jsonl TestReports_All.xlsx
+if __name__ == "__main__":
+    import sys
+
+    build_excel_from_jsonl(sys.argv[1], sys.argv[2])
+    print(f"Report rebuilt from '{sys.argv[1]}' and saved as '{sys.argv[2]}'.")
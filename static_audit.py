@@ -0,0 +1,121 @@
+# Browserless fast path for the SEO checks.
+# Pages are fetched over a pooled HTTP session and parsed without rendering,
+# producing the same page data as page_extract.extract_page_data() so the
+# H1, heading sequence and image alt checks run unchanged. ScriptData needs
+# JavaScript and is always None here; pages that look client-rendered are
+# returned as None so the caller can send them to Selenium instead.
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+
+from link_checker import DEFAULT_TIMEOUT
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+# A page with no headings and less visible body text than this is treated as client-rendered
+MIN_STATIC_TEXT_LENGTH = 200
+
+
+# Collects the page data with the standard library parser (used when lxml is missing)
+class _PageDataParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.base_url = None
+        self.headings = []
+        self.images = []
+        self.links = []
+        self.text_length = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in HEADING_TAGS:
+            self.headings.append(int(tag[1]))
+        elif tag == "img":
+            self.images.append([attrs.get("alt"), attrs.get("src")])
+        elif tag == "a":
+            self.links.append(attrs.get("href") if "href" in attrs else None)
+        elif tag == "base" and self.base_url is None and attrs.get("href"):
+            self.base_url = attrs["href"]
+        elif tag in ("script", "style", "noscript", "template"):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style", "noscript", "template") and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.text_length += len(data.strip())
+
+
+# Parse HTML into (base href, headings, images, links, visible text length)
+# Documents lxml rejects (a decoded string with an XML encoding declaration, or one
+# without any elements) go to the standard library parser instead
+def _parse_html(html):
+    doc = None
+    if lxml is not None:
+        try:
+            doc = lxml.html.fromstring(html)
+        except (ValueError, lxml.etree.LxmlError):
+            pass
+    if doc is not None:
+        base = doc.find(".//base[@href]")
+        headings = [int(el.tag[1]) for el in doc.iter(*HEADING_TAGS)]
+        images = [[el.get("alt"), el.get("src")] for el in doc.iter("img")]
+        links = [el.get("href") for el in doc.iter("a")]
+        for el in doc.iter("script", "style", "noscript", "template"):
+            el.drop_tree()
+        text_length = len("".join(doc.text_content().split()))
+        return (base.get("href") if base is not None else None), headings, images, links, text_length
+
+    parser = _PageDataParser()
+    parser.feed(html)
+    parser.close()
+    return parser.base_url, parser.headings, parser.images, parser.links, parser.text_length
+
+
+# Build page data from server-rendered HTML, resolving src/href like the browser does
+# Returns None when the page looks client-rendered and needs a real browser
+def page_data_from_html(html, url):
+    if not html.strip():
+        return None
+    base_url, headings, images, links, text_length = _parse_html(html)
+    if not headings and text_length < MIN_STATIC_TEXT_LENGTH:
+        return None
+    base_url = urljoin(url, base_url) if base_url else url
+    return {
+        "headings": headings,
+        "images": [[alt, urljoin(base_url, src) if src else src] for alt, src in images],
+        "links": [urljoin(base_url, href) if href is not None else None for href in links],
+        "script_data": None,
+    }
+
+
+# Absolute link targets of a page, resolved against its URL and <base> (used for crawling)
+def links_from_html(html, url):
+    if not html.strip():
+        return []
+    base_url, _, _, links, _ = _parse_html(html)
+    base_url = urljoin(url, base_url) if base_url else url
+    return [urljoin(base_url, href) for href in links if href]
+
+
+# Fetch one page and build its page data; None means the page must go through Selenium
+def fetch_page_data(session, url, timeout=DEFAULT_TIMEOUT):
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Static fetch failed for {url}: {e}")
+        return None
+    if response.status_code >= 400 or "html" not in response.headers.get("Content-Type", ""):
+        return None
+    return page_data_from_html(response.text, response.url)
+
@@ -0,0 +1,130 @@
+# Multi-tab runner: several tabs of one Chrome share a list of pages.
+# Each browser opens `tabs` window handles and starts a page load in every
+# idle tab without waiting for it (the navigation is issued from a script,
+# so the WebDriver call returns at once). It then polls the tabs in turn and
+# runs the job on the first tab whose page has loaded, while the others keep
+# loading, before starting that tab's next page. Page loads overlap with
+# extraction and result writing at the memory cost of one browser instead of
+# one per worker (see parallel_runner.py). Load timings measured in a tab
+# include contention with the pages loading alongside it.
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+DEFAULT_TABS = 4
+DEFAULT_LOAD_TIMEOUT = 60  # seconds
+POLL_INTERVAL = 0.05  # seconds between rounds of readiness checks when no tab is ready
+
+# Mark the current document, then navigate; the mark is gone once the new document exists
+NAVIGATE_JS = "window.__tabPoolLoading = true; window.location.href = arguments[0];"
+
+# null while the next document is pending or loading, else its URL once the load event has fired
+LOAD_STATE_JS = "return window.__tabPoolLoading || document.readyState !== 'complete' ? null : document.URL;"
+
+
+# Open tabs until the browser has `count` of them; returns their window handles
+def open_tabs(driver, count):
+    handles = list(driver.window_handles)
+    while len(handles) < count:
+        driver.switch_to.new_window("tab")
+        handles.append(driver.current_window_handle)
+    return handles[:count]
+
+
+# URL of the loaded page in the current tab, or None while it is still loading
+# Raises WebDriverException when Chrome shows its error page instead (e.g. DNS failure)
+def loaded_url(driver):
+    try:
+        url = driver.execute_script(LOAD_STATE_JS)
+    except WebDriverException:
+        return None  # The document was replaced while the script ran
+    if url is not None and url.startswith("chrome-error:"):
+        raise WebDriverException("Page could not be loaded")
+    return url
+
+
+# Run job(driver, url) for every URL once it has loaded in one of `tabs` tabs per browser
+# `browsers` drivers from create_driver() pull URLs from the shared iterator. Failed URLs
+# get on_error(url, exception) as their result (the exception is re-raised when no on_error
+# is given). Returns the results in input order.
+def run_in_tabs(urls, job, create_driver, tabs=DEFAULT_TABS, browsers=1, on_error=None,
+                load_timeout=DEFAULT_LOAD_TIMEOUT):
+    source = enumerate(urls)
+    source_lock = threading.Lock()
+    results = {}
+    errors = []
+
+    # Take the next (index, url) pair, or None when the input is exhausted
+    def next_item():
+        with source_lock:
+            return next(source, None)
+
+    def finish(index, url, error):
+        if on_error is None:
+            errors.append(error)
+        else:
+            results[index] = on_error(url, error)
+
+    def worker():
+        driver = None
+        try:
+            idle, loading = [], {}  # Tabs without a page; tab -> (index, url, started)
+            exhausted = False
+            while not errors:
+                # Start a page load in every idle tab
+                while not exhausted and (idle or driver is None):
+                    entry = next_item()
+                    if entry is None:
+                        exhausted = True
+                        break
+                    index, url = entry
+                    if driver is None:
+                        try:
+                            driver = create_driver()
+                            idle = open_tabs(driver, max(1, tabs))
+                        except Exception as e:
+                            finish(index, url, e)
+                            continue
+                    handle = idle.pop()
+                    try:
+                        driver.switch_to.window(handle)
+                        driver.execute_script(NAVIGATE_JS, url)
+                        loading[handle] = (index, url, time.monotonic())
+                    except WebDriverException as e:
+                        idle.append(handle)
+                        finish(index, url, e)
+                if not loading:
+                    break
+
+                # Run the job on every tab that has finished loading
+                progressed = False
+                for handle, (index, url, started) in list(loading.items()):
+                    try:
+                        driver.switch_to.window(handle)
+                        if loaded_url(driver) is None:
+                            if time.monotonic() - started < load_timeout:
+                                continue
+                            raise TimeoutException(f"Page load timed out after {load_timeout}s")
+                        results[index] = job(driver, url)
+                    except Exception as e:
+                        finish(index, url, e)
+                    del loading[handle]
+                    idle.append(handle)
+                    progressed = True
+                    break  # Start the tab's next load before extracting from another tab
+                if not progressed:
+                    time.sleep(POLL_INTERVAL)
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    threads = [threading.Thread(target=worker, name=f"tab-browser-{i + 1}") for i in range(max(1, browsers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return [results[index] for index in sorted(results)]
@@ -1,39 +1,40 @@
-import openpyxl
-from openpyxl.styles import Font
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import requests
-import time
-
-# Initialize the Excel report
-def initialize_excel_report():
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = "Test Report"
-    sheet.append(["Page URL", "Test Name", "Status", "Comments"])  
-    for cell in sheet[1]:
-        cell.font = Font(bold=True)  
-    return workbook, sheet
+import argparse
+from contextlib import nullcontext
+from browser import create_chrome_driver
+from browser_profiles import FULL, PROFILES, chrome_options, cold_cache
+from page_session import PageSession
+from check_registry import BROWSER, DEFAULT_WORKERS, DOM, ISOLATED_PAGE, NETWORK, CheckContext, CheckRegistry, run_checks
+from dom_waits import scroll_into_view
+from currency_matrix import (
+    CURRENCY_OPTIONS_XPATH, READ_PRICES_JS, collect_currencies, currency_result_rows,
+    open_currency_dropdown, read_initial_prices, run_currency_matrix, wait_for_price_update,
+)
+from link_checker import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, check_links, url_status_rows
+from link_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LinkCache
+from report_writer import StreamingReport
+from result_sinks import SINK_FORMATS
+from checkpoint import CheckpointJournal
+from instrumentation import RunTimings, profiled
+from wait_policy import DEFAULT_HISTORY_PATH, WaitPolicy
+from perf_metrics import PERFORMANCE_HEADERS, collect_page_metrics, parse_thresholds, performance_row
+
+# Initialize the report; rows are streamed to every requested format and the xlsx is written once at the end
+def initialize_excel_report(base_path, formats=("excel",)):
+    report = StreamingReport(base_path, formats)
+    sheet = report.create_sheet("Test Report", ["Page URL", "Test Name", "Status", "Comments", "Browser Profile"])
+    return report, sheet
 
 # H1 Tag Existence Test
-def test_h1_tag(driver, url):
-    driver.get(url)
-    try:
-        h1_tag = driver.find_element(By.TAG_NAME, "h1")
+def test_h1_tag(page_data):
+    if 1 in page_data["headings"]:
         return ("H1 Tag Existence", "Pass", "H1 tag found")
-    except:
-        return ("H1 Tag Existence", "Fail", "H1 tag missing")
+    return ("H1 Tag Existence", "Fail", "H1 tag missing")
 
 # HTML Tag Sequence Test
-def test_html_tag_sequence(driver, url):
-    driver.get(url)
-    headings = driver.find_elements(By.XPATH, "//h1 | //h2 | //h3 | //h4 | //h5 | //h6")
-    heading_levels = [int(h.tag_name[1]) for h in headings]  # Extract the number from h1, h2, etc.
+def test_html_tag_sequence(page_data):
+    heading_levels = page_data["headings"]  # Heading levels in document order (1 for h1, 2 for h2, etc.)
 
     # Check if the sequence is correct
     for i in range(1, len(heading_levels)):
@@ -47,21 +48,15 @@ def test_html_tag_sequence(driver, url):
 
 
 # Image Alt Attribute Test
-def test_image_alt_attribute(driver, url, workbook):
-    driver.get(url)
-    images = driver.find_elements(By.TAG_NAME, "img")  
+def test_image_alt_attribute(page_data, report):
     missing_alt = []  # List to store images missing the alt attribute
 
-    for img in images:
-        alt_text = img.get_attribute("alt")
+    for alt_text, src in page_data["images"]:
         if not alt_text:  
-            missing_alt.append(img.get_attribute("src"))  # Store the image source for reference
+            missing_alt.append(src)  # Store the image source for reference
 
     if missing_alt:
-        sheet = workbook.create_sheet(title="Img Alt Attributes")
-        sheet.append(["Image Src", "Alt Status"])  
-        for cell in sheet[1]:
-            cell.font = Font(bold=True)  # Make headers bold
+        sheet = report.create_sheet("Img Alt Attributes", ["Image Src", "Alt Status"])
 
         # Append details of each missing alt attribute
         for src in missing_alt:
@@ -73,26 +68,22 @@ def test_image_alt_attribute(driver, url, workbook):
 
 
 # URL Status Code Test
-def test_url_status_code(driver, url, sheet_urls):
-    driver.get(url)
-    # Find only <a> tags within the body of the page
-    body = driver.find_element(By.TAG_NAME, 'body')
-    links = body.find_elements(By.TAG_NAME, "a")  
-    broken_links = []  
-
-    for link in links:
-        href = link.get_attribute("href")  
-        if href:  # Ensure the link is not empty
-            try:
-                response = requests.head(href, allow_redirects=True)  # Check the URL status
-                if response.status_code == 404:  # Log only broken links
-                    broken_links.append(href)
-                    sheet_urls.append([href, "Fail", "404 Not Found"])
-            except requests.RequestException as e:  # Log request errors
-                broken_links.append(href)
-                sheet_urls.append([href, "Fail", f"Request error: {str(e)}"])
-        else:
-            sheet_urls.append(["Empty Link", "Fail", "No href attribute found"])  # Log missing href attributes
+def test_url_status_code(page_data, sheet_urls, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, cache=None,
+                         scheduler=None):
+    # Only <a> tags within the body of the page are collected
+    hrefs = page_data["links"]
+
+    # Check every distinct link concurrently over a shared, pooled session, paced per host,
+    # reusing results from earlier runs that are still fresh in the cache
+    results = check_links([href for href in hrefs if href], concurrency=concurrency, timeout=timeout, cache=cache,
+                          scheduler=scheduler)
+
+    # Log broken links, request errors and missing href attributes
+    broken_links = []
+    for row in url_status_rows(hrefs, results):
+        sheet_urls.append(row)
+        if row[0] != "Empty Link":
+            broken_links.append(row[0])
 
     # Return the test result
     if broken_links:
@@ -101,54 +92,60 @@ def test_url_status_code(driver, url, sheet_urls):
         return ("URL Status Code", "Pass", "No broken links found")
 
 
+# Page Performance Test
+# Reads navigation, paint and resource timings of the fully loaded page
+# The page is reloaded with the HTTP cache bypassed; after the earlier loads of the
+# other checks its resources would come from the cache and transfer 0 bytes
+def test_page_performance(report, page, url, thresholds):
+    page.invalidate()
+    with cold_cache(page.driver):
+        metrics = collect_page_metrics(page.load(url, profile=FULL))
+    row = performance_row(metrics, thresholds)
+    sheet = report.create_sheet("Page Performance", PERFORMANCE_HEADERS)
+    sheet.append([url] + row)
+    status, comments = row[-2:]
+    return ("Page Performance", status, comments)
+
+
 # Currency filtering and ensure property tiles currency changed
-def test_currency_change_for_all(workbook, driver, url):
+# With workers > 0 every currency is tested on its own page load in a separate browser
+# Wait timeouts come from the WaitPolicy when one is given
+def test_currency_change_for_all(report, page, url, workers=0, create_driver=None, waits=None):
     
-    sheet = workbook.create_sheet(title="Currency Change Results")
-    sheet.append([
+    sheet = report.create_sheet("Currency Change Results", [
         "Currency", "Card", "Initial Price", "Updated Price", "Card Test Result",
-        "Initial Availability Price", "Updated Availability Price", "Availability Test Result"
-    ])  
-    for cell in sheet[1]:
-        cell.font = Font(bold=True)  
-
-    # Open the webpage
-    driver.get(url)
-
-    # Capture the initial value of the availability price
-    availability_price_element = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, 'js-default-price'))
-    )
-    initial_availability_price = availability_price_element.text.strip()
-    print(f"Initial Availability Price: {initial_availability_price}")
-
-    # Wait for the price elements to load in cards
+        "Initial Availability Price", "Updated Availability Price", "Availability Test Result",
+        "Price Update Wait (s)"
+    ])
+
+    # Reuse the loaded page if it was fully loaded; the currency switch changes it, so drop it afterwards
+    driver = page.load(url, profile=FULL)
+
+    if workers:
+        # Collect the currency list once, then test the currencies independently
+        currencies = collect_currencies(driver, waits)
+        page.invalidate()
+        print(f"Found {len(currencies)} currency options, testing them across {workers} workers.")
+        rows, errors = run_currency_matrix(url, currencies, create_driver, workers=workers, waits=waits)
+        for row in rows:
+            sheet.append(row)
+        if errors:
+            return "Currency Change Test", "Fail", f"{errors} of {len(currencies)} currencies could not be tested"
+        return "Currency Change Test", "Pass", "Currency test results saved in Excel"
+
+    # Capture the initial availability price and the prices in the cards
     print("Waiting for price elements...")
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CLASS_NAME, 'js-price-value'))
-    )
-    price_elements = driver.find_elements(By.CLASS_NAME, 'js-price-value')
-    initial_prices = [elem.text for elem in price_elements]
+    initial_availability_price, initial_prices = read_initial_prices(driver, waits)
+    print(f"Initial Availability Price: {initial_availability_price}")
     print(f"Found {len(initial_prices)} price elements.")
 
-    # Scroll to the footer section to locate the currency dropdown
+    # Scroll to the footer section and open the currency dropdown
     print("Waiting for currency dropdown to become present...")
-    WebDriverWait(driver, 60).until(
-        EC.presence_of_element_located((By.ID, 'js-currency-sort-footer'))
-    )
-    footer_currency_element = driver.find_element(By.ID, 'js-currency-sort-footer')
-    driver.execute_script("arguments[0].scrollIntoView(true);", footer_currency_element)
-    time.sleep(1)  # Wait for the scroll to complete
-
-    # Click on the currency dropdown
-    currency_dropdown = WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.ID, 'js-currency-sort-footer'))
-    )
-    currency_dropdown.click()
+    open_currency_dropdown(driver, waits)
     print("Currency dropdown clicked.")
 
     # Fetch all available currency options
-    currency_options = driver.find_elements(By.XPATH, "//div[@class='footer-section']//div[@class='footer-currency-dd']//ul[@class='select-ul']//li")
+    currency_options = driver.find_elements(By.XPATH, CURRENCY_OPTIONS_XPATH)
     print(f"Found {len(currency_options)} currency options.")
 
     # Iterate over each currency option
@@ -163,84 +160,43 @@ def test_currency_change_for_all(workbook, driver, url):
         print(f"\nTesting currency: {currency_text}")
 
         # Scroll to and click on the currency option
-        driver.execute_script("arguments[0].scrollIntoView(true);", currency_option)
-        time.sleep(1)
+        scroll_into_view(driver, currency_option)
         try:
             currency_option.click()
         except Exception:
             driver.execute_script("arguments[0].click();", currency_option)
         
-        # Wait for the availability price to update
-        WebDriverWait(driver, 60).until(
-            EC.text_to_be_present_in_element((By.ID, 'js-default-price'), currency_text.split()[0])
-        )
-        # Capture the update value of the availability price
-        availability_price_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, 'js-default-price'))
-        )
-        updated_availability_price = availability_price_element.text.strip()
+        # Wait until the availability price and the card prices show the new currency
+        price_update_wait = wait_for_price_update(driver, currency_text, waits)
+        print(f"Prices updated after {price_update_wait:.2f}s")
+
+        # Capture the updated availability price and card prices
+        updated_availability_price, updated_prices = driver.execute_script(READ_PRICES_JS)
         print(f"Updated Availability Price: {updated_availability_price}")
 
-        # Wait for the prices to update in the cards
-        WebDriverWait(driver, 60).until(
-            EC.text_to_be_present_in_element((By.CLASS_NAME, 'js-price-value'), currency_text.split()[0])
-        )
-        updated_price_elements = driver.find_elements(By.CLASS_NAME, 'js-price-value')
-        updated_prices = [elem.text for elem in updated_price_elements]
-
-        # Compare initial and updated prices
-        for i in range(len(initial_prices)):
-
-            card_result = "PASS (Currency changed successfully)" if currency_text.split()[0] in updated_prices[i] else "FAIL (Currency did not change)"
-            availability_result = "PASS (Currency changed successfully)" if currency_text.split()[0] in updated_availability_price else "FAIL (Currency did not change)"
-            
-            # Write the results into the sheet
-            if i == 0:  # Write availability prices only for the first card of the currency
-                sheet.append([
-                    currency_text, 
-                    f"Card {i + 1}",
-                    initial_prices[i], 
-                    updated_prices[i], 
-                    card_result,
-                    initial_availability_price,
-                    updated_availability_price,
-                    availability_result
-                ])
-            else:
-                sheet.append([
-                    currency_text, 
-                    f"Card {i + 1}",
-                    initial_prices[i], 
-                    updated_prices[i], 
-                    card_result,
-                    "",  # No need to repeat availability prices
-                    "",
-                    ""
-                ])
+        # Compare initial and updated prices and write the results into the sheet
+        for row in currency_result_rows(currency_text, initial_prices, updated_prices,
+                                        initial_availability_price, updated_availability_price, price_update_wait):
+            sheet.append(row)
 
         # Reopen the dropdown for the next currency
         currency_dropdown = driver.find_element(By.ID, 'js-currency-sort-footer')
-        driver.execute_script("arguments[0].scrollIntoView(true);", currency_dropdown)
+        scroll_into_view(driver, currency_dropdown)
         currency_dropdown.click()
-        currency_options = driver.find_elements(By.XPATH, "//div[@class='footer-section']//div[@class='footer-currency-dd']//ul[@class='select-ul']//li")
 
+    page.invalidate()
     return "Currency Change Test", "Pass", "Currency test results saved in Excel"
 
 
 # Write the Scraped Data (Sheet 4)
-def write_scraped_data(workbook, driver, url):
-    sheet = workbook.create_sheet(title="Scraped Data")
-    sheet.append(["Site URL", "Campaign ID", "Site Name", "Browser", "Country Code", "IP"])
-    for cell in sheet[1]:
-        cell.font = Font(bold=True)  
-
-    # Navigate to the URL
-    driver.get(url)
+def write_scraped_data(report, page_data):
+    sheet = report.create_sheet("Scraped Data", ["Site URL", "Campaign ID", "Site Name", "Browser", "Country Code", "IP"])
+
+    # The 'ScriptData' fields are collected with the rest of the page data
+    script_data = page_data["script_data"]
     try:
-        # Execute JavaScript to get the 'ScriptData' object
-        script_data = driver.execute_script("""
-            return ScriptData;
-        """)
+        if script_data is None:
+            raise ValueError("ScriptData is not defined on the page")
 
         site_url = script_data['config']['SiteUrl']
         campaign_id = script_data['pageData']['CampaignId']
@@ -257,61 +213,164 @@ def write_scraped_data(workbook, driver, url):
     return "Scraped Data", "Pass" if script_data else "Fail", "Data written to sheet" if script_data else "No data found"
 
 
+# Checks run by main(), each declaring what it needs (see check_registry.py); registering a check adds it to the run
+# Registration order is the run order with one worker; the Currency Change test changes the page, so it comes last
+checks = CheckRegistry()
+
+
+@checks.register("H1 Tag Existence", needs={DOM})
+def check_h1_tag(ctx):
+    return test_h1_tag(ctx.page_data())
+
+
+@checks.register("HTML Tag Sequence", needs={DOM})
+def check_html_tag_sequence(ctx):
+    return test_html_tag_sequence(ctx.page_data())
+
+
+@checks.register("Image Alt Attribute", needs={DOM})
+def check_image_alt_attribute(ctx):
+    return test_image_alt_attribute(ctx.page_data(), ctx.report)
+
+
+# Run the URL status code test with the persistent link cache
+@checks.register("URL Status Code", needs={DOM, NETWORK})
+def check_url_status_code(ctx):
+    options = ctx.options
+    link_cache = LinkCache(options.link_cache, ttl=options.link_cache_ttl, bypass=options.no_link_cache)
+    page_data = ctx.page_data()
+    sheet_urls = ctx.report.create_sheet("URL Status", ["URL", "Status", "Comments"])
+    with ctx.timings.measure("link_checks"):
+        result = test_url_status_code(page_data, sheet_urls, cache=link_cache)
+    link_cache.save()
+    print(f"Link cache: {link_cache.hits} hit(s), {link_cache.misses} miss(es).")
+    return result
+
+
+@checks.register("Scraped Data", needs={DOM})
+def check_scraped_data(ctx):
+    return write_scraped_data(ctx.report, ctx.page_data())
+
+
+@checks.register("Page Performance", needs={BROWSER})
+def check_page_performance(ctx):
+    return test_page_performance(ctx.report, ctx.page, ctx.url, parse_thresholds(ctx.options.perf_threshold))
+
+
+@checks.register("Currency Change Test", needs={ISOLATED_PAGE})
+def check_currency_change(ctx):
+    with ctx.isolated_page() as page:
+        return test_currency_change_for_all(ctx.report, page, ctx.url, workers=ctx.options.currency_workers,
+                                            create_driver=ctx.create_driver, waits=ctx.waits)
+
+
 # Main function to run the tests and generate the Excel report
 def main():
-    # Set up the WebDriver
-    options = webdriver.ChromeOptions()
-    #options.add_argument('--headless')  # Uncomment it if you want it to run in headless mode.
-    options.add_argument('--disable-gpu')  
-
-    # Use Service to pass the executable path
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    parser = argparse.ArgumentParser(description="Run the SEO, link, currency and ScriptData tests.")
+    parser.add_argument("--link-cache", default=DEFAULT_CACHE_PATH, help="Link status cache file")
+    parser.add_argument("--link-cache-ttl", type=int, default=DEFAULT_TTL, help="Seconds before a cached link status is re-checked")
+    parser.add_argument("--no-link-cache", action="store_true", help="Ignore cached link statuses and check every link")
+    parser.add_argument("--format", action="append", choices=SINK_FORMATS, dest="formats",
+                        help="Result format to write; repeat for several (default: excel)")
+    parser.add_argument("--currency-workers", type=int, default=0,
+                        help="Test each currency on its own page load across this many browsers (default: one page, in sequence)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip tests completed by an interrupted run and rebuild the report from its journal")
+    parser.add_argument("--profile-test", metavar="TEST_NAME",
+                        help="Run one test (e.g. 'URL Status Code') under cProfile and save '<name>.prof'")
+    parser.add_argument("--perf-threshold", action="append", metavar="METRIC=VALUE",
+                        help="Override a page performance threshold, e.g. lcp=3000 or cls=0.25 (see perf_metrics.py)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="lean",
+                        help="Browser profile for the structural checks; 'lean' blocks images, fonts and trackers "
+                             "(the currency and performance tests always use the full profile)")
+    parser.add_argument("--wait-history", default=DEFAULT_HISTORY_PATH,
+                        help="File of past wait durations used to set adaptive timeouts")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                        help="Use the fixed default timeouts (durations are still recorded)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window instead of running headless")
+    parser.add_argument("--test-workers", type=int, default=DEFAULT_WORKERS,
+                        help="Checks to run at once; the Currency Change test then gets its own browser "
+                             "(1 runs every check in turn on one page)")
+    args = parser.parse_args()
+    try:
+        parse_thresholds(args.perf_threshold)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Set up the WebDriver; the session serves both profiles, blocking is switched per page load
+    profile = PROFILES[args.profile]
+    options = chrome_options(profile, headless=not args.headed)
+
+    # Start Chrome with a locally resolved chromedriver (see driver_resolver.py)
+    driver = create_chrome_driver(options)
+
+    # Record navigation, WebDriver command, wait and report I/O timings per test
+    timings = RunTimings()
+    timings.instrument_driver(driver)
+    timings.instrument_waits()
     
     # Test site URL
     url = "https://www.alojamiento.io/property/apartamentos-centro-coló3n/BC-189483"
     
     # Initialize the Excel report
-    workbook, sheet = initialize_excel_report()
-    
-    # Create a new sheet for URL status results
-    sheet_urls = workbook.create_sheet(title="URL Status")
-    sheet_urls.append(["URL", "Status", "Comments"])  # Header row
-    for cell in sheet_urls[1]:
-        cell.font = Font(bold=True)  # Make headers bold
+    report, sheet = initialize_excel_report("TestReports_All", args.formats or ("excel",))
+    timings.instrument_report(report)
     
-    # Run the H1 tag test
-    test_name, status, comments = test_h1_tag(driver, url)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
-
-    # Run the HTML tag sequence test
-    test_name, status, comments = test_html_tag_sequence(driver, url)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
-
-    # Run the image alt attribute test
-    test_name, status, comments = test_image_alt_attribute(driver, url, workbook)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
-
-    # Run the URL status code test
-    test_name, status, comments = test_url_status_code(driver, url, sheet_urls)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
-
-    # Run the Currency Change test
-    test_name, status, comments = test_currency_change_for_all(workbook, driver, url)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
-
-    # Run the ScriptData test
-    test_name, status, comments = write_scraped_data(workbook, driver, url)
-    sheet.append([url, test_name, status, comments])
-    workbook.save("TestReports_All.xlsx")
+    # Every read-only check shares a single load of the page, made when the first check needs it
+    # Timeouts learned from earlier runs, so a stuck wait fails in seconds rather than a minute
+    waits = WaitPolicy(args.wait_history, adaptive=not args.fixed_timeouts)
+    page = PageSession(driver, profile, waits)
+    context = CheckContext(
+        url, page, report, options=args, timings=timings, waits=waits,
+        # Drivers of isolated pages and currency workers are instrumented like the shared one
+        create_driver=lambda: timings.instrument_driver(create_chrome_driver(chrome_options(FULL, headless=not args.headed))),
+        isolate=args.test_workers > 1,
+    )
 
-    
-    print("Test completed. Report saved as 'TestReports_All.xlsx'.")
+    # Each finished test is journaled with the rows it wrote; --resume replays those instead of re-running
+    journal = CheckpointJournal("TestReports_All.journal.jsonl", resume=args.resume)
+    pending = []
+    for check in checks:
+        key = f"{url} | {check.name}"
+        if journal.is_done(key):
+            print(f"Skipping {check.name}: completed in an earlier run.")
+            report.replay(journal.get(key))
+        else:
+            pending.append(check)
+
+    # Run one check on a scheduler thread, capturing the rows it writes
+    # A check that raises is reported as failed and left out of the journal, so --resume runs it again
+    # With several workers, the timing categories of a check include work of the checks running alongside it
+    errored = set()
+
+    def run_check(check):
+        report.begin_capture()
+        profile = profiled(f"{check.name}.prof") if check.name == args.profile_test else nullcontext()
+        with timings.test(check.name), profile:
+            try:
+                test_name, status, comments = check.func(context)
+            except Exception as e:
+                print(f"Error running {check.name}: {e}")
+                errored.add(check.name)
+                test_name, status, comments = check.name, "Fail", f"Error: {e}"
+            sheet.append([url, test_name, status, comments, context.profile_name(check)])
+        return report.end_capture()
+
+    def record(check, events):
+        if check.name not in errored:
+            journal.record(f"{url} | {check.name}", events)
+
+    run_checks(pending, run_check, workers=args.test_workers, browser_lock=context.browser_lock, on_done=record)
+    journal.close()
+
+    # Write the timings and then the report once all tests have finished
+    timings.write_sheet(report)
+    waits.write_sheet(report)
+    waits.save()
+    print(f"Time lost to timed-out waits: {waits.wasted:.2f}s.")
+    report.close()
+    timings.write_json("TestReports_All.timings.json")
+    print(f"Test completed in {page.load_count} page load(s). Results saved as 'TestReports_All' ({', '.join(args.formats or ['excel'])}).")
     
     # Quit the WebDriver
     driver.quit()
@@ -0,0 +1,31 @@
+# URL helpers shared by the link checker, the link cache and the URL lists
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+# Normalize a URL so equivalent spellings compare equal:
+# lowercase scheme and host, no default port, no fragment, no trailing slash
+# A malformed URL (e.g. a bad port or IPv6 host) is returned stripped but otherwise as is
+def normalize_url(url):
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+# Build the set of pages to test from a URL list that may contain duplicates
+# Returns {normalized URL: first original spelling}, in input order; results
+# keyed by normalize_url() can then be fanned back out to every original URL
+def build_url_set(urls):
+    url_set = {}
+    for url in urls:
+        url_set.setdefault(normalize_url(url), url)
+    return url_set
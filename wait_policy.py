@@ -0,0 +1,106 @@
+# Adaptive timeouts for named waits.
+# Every named wait (e.g. "price_update") records how long it took. Once a
+# wait has enough history, its timeout is a high percentile of the past
+# durations times a safety margin, clamped between a floor and a ceiling, so
+# a wait that runs well past its usual time fails in seconds instead of a
+# minute, while slow-but-healthy pages get the time they normally need. Waits
+# without history use their old fixed timeout. A wait that times out is
+# recorded as having needed more than it got (its timeout times the margin),
+# so repeated timeouts raise the learned timeout again instead of leaving it
+# stuck at the floor. Time spent in waits that timed out is reported as
+# wasted. The history is kept on disk between runs.
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from selenium.common.exceptions import TimeoutException
+
+from instrumentation import percentile
+from json_store import load_json, save_json
+
+DEFAULT_HISTORY_PATH = "wait_history.json"
+DEFAULT_PERCENTILE = 95
+DEFAULT_MARGIN = 1.5
+DEFAULT_FLOOR = 2  # seconds
+DEFAULT_CEILING = 60  # seconds
+MIN_SAMPLES = 5
+MAX_SAMPLES = 200  # Most recent durations kept per wait
+
+WAIT_HEADERS = ["Wait", "History Samples", "Timeout (s)", "Waits", "Timeouts", "Longest (s)", "Wasted (s)"]
+
+
+class WaitPolicy:
+    def __init__(self, path=DEFAULT_HISTORY_PATH, pct=DEFAULT_PERCENTILE, margin=DEFAULT_MARGIN,
+                 floor=DEFAULT_FLOOR, ceiling=DEFAULT_CEILING, adaptive=True):
+        self.path = path
+        self.pct = pct
+        self.margin = margin
+        self.floor = floor
+        self.ceiling = ceiling
+        self.adaptive = adaptive
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._history = load_json(path, "wait history")
+
+    # Timeout for a named wait: learned from its history, or `default` until there is enough of it
+    def timeout(self, name, default):
+        samples = self._history.get(name, [])
+        if not self.adaptive or len(samples) < MIN_SAMPLES:
+            return default
+        return min(self.ceiling, max(self.floor, percentile(samples, self.pct) * self.margin))
+
+    # Run the enclosed wait with the timeout it yields and record how long it took
+    # A TimeoutException raised inside counts the whole wait as wasted and is re-raised
+    @contextmanager
+    def wait(self, name, default):
+        timeout = self.timeout(name, default)
+        start = time.perf_counter()
+        try:
+            yield timeout
+        except TimeoutException:
+            self._record(name, timeout, time.perf_counter() - start, timed_out=True)
+            raise
+        self._record(name, timeout, time.perf_counter() - start, timed_out=False)
+
+    def _record(self, name, timeout, elapsed, timed_out):
+        with self._lock:
+            stats = self.stats.setdefault(name, {"timeout": timeout, "waits": 0, "timeouts": 0, "longest": 0, "wasted": 0})
+            stats["timeout"] = timeout
+            stats["waits"] += 1
+            stats["longest"] = max(stats["longest"], elapsed)
+            if timed_out:
+                stats["timeouts"] += 1
+                stats["wasted"] += elapsed
+                # The page needed more than `timeout`; record a longer duration than any timed-out wait saw
+                elapsed = min(self.ceiling, max(timeout, elapsed) * self.margin)
+            self._history.setdefault(name, []).append(round(elapsed, 3))
+
+    # Seconds spent in waits that timed out during this run
+    @property
+    def wasted(self):
+        return sum(stats["wasted"] for stats in self.stats.values())
+
+    # Write the history back to disk, keeping the most recent MAX_SAMPLES durations per wait
+    def save(self):
+        save_json(self.path, {name: samples[-MAX_SAMPLES:] for name, samples in self._history.items()})
+
+    # Rows for the "Waits" sheet: one per named wait plus a total row
+    def rows(self):
+        rows = [[name, len(self._history.get(name, [])), round(stats["timeout"], 2), stats["waits"], stats["timeouts"],
+                 round(stats["longest"], 2), round(stats["wasted"], 2)]
+                for name, stats in sorted(self.stats.items())]
+        rows.append(["Total", "", "", sum(stats["waits"] for stats in self.stats.values()),
+                     sum(stats["timeouts"] for stats in self.stats.values()), "", round(self.wasted, 2)])
+        return rows
+
+    def write_sheet(self, report):
+        sheet = report.create_sheet("Waits", WAIT_HEADERS)
+        for row in self.rows():
+            sheet.append(row)
+
+
+# policy.wait(name, default), or the fixed default timeout when no policy is used
+def adaptive_wait(policy, name, default):
+    if policy is None:
+        return nullcontext(default)
+    return policy.wait(name, default)